@@ -153,6 +153,9 @@ CREATE TABLE favorites (
 CREATE INDEX IF NOT EXISTS idx_favorites_student ON favorites(student_id);
 CREATE INDEX IF NOT EXISTS idx_favorites_event ON favorites(event_id);
 CREATE INDEX IF NOT EXISTS idx_favorites_created ON favorites(created_at DESC);
+-- Покрывающий индекс для списка избранного студента (WHERE student_id ORDER BY created_at DESC LIMIT)
+CREATE INDEX IF NOT EXISTS idx_favorites_student_created
+    ON favorites(student_id, created_at DESC) INCLUDE (event_id);
 
 -- ==========================================
 -- ИНДЕКСЫ
@@ -166,10 +169,18 @@ CREATE INDEX IF NOT EXISTS idx_students_vector
 
 CREATE INDEX IF NOT EXISTS idx_directions_cluster ON directions(cluster_id);
 CREATE INDEX IF NOT EXISTS idx_students_direction ON students(direction_id);
+-- Keyset-пагинация списка студентов (ORDER BY created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_students_created_id ON students(created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_event_clusters_cluster ON event_clusters(cluster_id);
 CREATE INDEX IF NOT EXISTS idx_event_clusters_event ON event_clusters(event_id);
+CREATE INDEX IF NOT EXISTS idx_event_clusters_cluster_event ON event_clusters(cluster_id, event_id);
 CREATE INDEX IF NOT EXISTS idx_events_is_active ON events(is_active);
+-- Частичный индекс: выборки списков почти всегда идут только по активным мероприятиям
+CREATE INDEX IF NOT EXISTS idx_events_active_id ON events(id) WHERE is_active;
 CREATE INDEX IF NOT EXISTS idx_events_dates ON events(start_date, end_date);
+-- Ближайшие мероприятия (/events/upcoming): ORDER BY COALESCE(start_date, date(created_at)) LIMIT
+CREATE INDEX IF NOT EXISTS idx_events_active_sort_date
+    ON events ((COALESCE(start_date, date(created_at)))) WHERE is_active;
 CREATE INDEX IF NOT EXISTS idx_directions_id_cluster ON directions(id, cluster_id);
 
 -- ==========================================
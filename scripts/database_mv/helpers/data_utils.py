@@ -1,5 +1,29 @@
 import pandas as pd
 from pathlib import Path
+from openpyxl import Workbook
+
+def read_excel_cached(file_path: Path, header: int = 0) -> pd.DataFrame:
+    """
+    Читает Excel через parquet-кэш рядом с исходным файлом.
+
+    Кэш ``.cache/<имя>.h<header>.parquet`` используется, пока он не старше
+    самого Excel-файла; иначе файл перечитывается и кэш обновляется.
+    """
+    cache_file = file_path.parent / ".cache" / f"{file_path.stem}.h{header}.parquet"
+    if cache_file.exists() and cache_file.stat().st_mtime >= file_path.stat().st_mtime:
+        try:
+            return pd.read_parquet(cache_file)
+        except Exception as exc:
+            print(f"⚠️ Не удалось прочитать кэш {cache_file}: {exc}")
+
+    df = pd.read_excel(file_path, header=header)
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        df.to_parquet(cache_file, compression="zstd", index=False)
+    except Exception as exc:
+        # Смешанные типы в столбцах или отсутствие pyarrow не должны ломать загрузку
+        print(f"⚠️ Не удалось сохранить кэш {cache_file}: {exc}")
+    return df
 
 def load_excel(file_path: Path, header_row: int = None, required_cols: list[str] = None) -> pd.DataFrame:
     if not file_path.exists():
@@ -14,14 +38,14 @@ def load_excel(file_path: Path, header_row: int = None, required_cols: list[str]
     
     # Если header_row указан явно, используем его
     if header_row is not None:
-        df = pd.read_excel(file_path, header=header_row)
+        df = read_excel_cached(file_path, header=header_row)
         return normalize_columns(df)
     
     # Если есть required_cols, пробуем найти правильный header_row
     if required_cols:
         # Сначала пробуем header_row=0 (A1)
         try:
-            df = pd.read_excel(file_path, header=0)
+            df = read_excel_cached(file_path, header=0)
             df = normalize_columns(df)
             missing_cols = [col for col in required_cols if col not in df.columns]
             if not missing_cols:
@@ -32,7 +56,7 @@ def load_excel(file_path: Path, header_row: int = None, required_cols: list[str]
         
         # Если не получилось, пробуем header_row=2 (B2, третья строка)
         try:
-            df = pd.read_excel(file_path, header=2)
+            df = read_excel_cached(file_path, header=2)
             df = normalize_columns(df)
             missing_cols = [col for col in required_cols if col not in df.columns]
             if not missing_cols:
@@ -43,7 +67,7 @@ def load_excel(file_path: Path, header_row: int = None, required_cols: list[str]
         
         # Если оба варианта не подошли, пробуем header_row=1 на всякий случай
         try:
-            df = pd.read_excel(file_path, header=1)
+            df = read_excel_cached(file_path, header=1)
             df = normalize_columns(df)
             missing_cols = [col for col in required_cols if col not in df.columns]
             if not missing_cols:
@@ -53,7 +77,7 @@ def load_excel(file_path: Path, header_row: int = None, required_cols: list[str]
             pass
     
     # Если required_cols не указаны или ничего не подошло, используем дефолтный header_row=2
-    df = pd.read_excel(file_path, header=2)
+    df = read_excel_cached(file_path, header=2)
     return normalize_columns(df)
 
 def validate_columns(df: pd.DataFrame, required_cols: list[str]) -> None:
@@ -73,8 +97,22 @@ def keep_latest_records(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 def save_to_excel(df: pd.DataFrame, output_file: Path) -> None:
+    """
+    Сохраняет DataFrame в Excel в потоковом (write-only) режиме openpyxl.
+
+    В отличие от ``df.to_excel`` строки сразу сбрасываются в файл и не держатся
+    в памяти как объекты ячеек, поэтому пиковое потребление памяти не растёт
+    вместе с размером таблицы.
+    """
     output_file.parent.mkdir(exist_ok=True)
-    df.to_excel(output_file, index=False)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(col) for col in df.columns])
+    # NaN/NaT в Excel должны быть пустыми ячейками, как при df.to_excel
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(output_file)
     print(f"✅ Файл сохранён: {output_file}")
 
 def preprocess_excel(
@@ -99,48 +137,32 @@ def preprocess_excel(
     """
     df = load_excel(input_path, required_cols=required_cols)
     validate_columns(df, required_cols)
-    df = clean_and_filter(df, target_university)
-    df = keep_latest_records(df)
     
     # Нормализуем названия столбцов (на всякий случай)
     df.columns = df.columns.str.strip()
     
-    # Находим столбцы из columns_to_keep, которые есть в файле
-    available_from_list = [col for col in columns_to_keep if col in df.columns]
-    missing_from_list = [col for col in columns_to_keep if col not in df.columns]
-    
-    # Если после "Пассивный словарный запас" в файле есть дополнительные столбцы,
-    # автоматически добавляем их все
-    cols_to_save = available_from_list.copy()
-    
-    if "Пассивный словарный запас" in df.columns:
-        passive_vocab_idx = list(df.columns).index("Пассивный словарный запас")
-        # Находим все столбцы после "Пассивный словарный запас" в исходном файле
-        cols_after_passive = list(df.columns[passive_vocab_idx + 1:])
-        
-        # Добавляем все столбцы после "Пассивный словарный запас", которых еще нет в списке
-        for col in cols_after_passive:
-            if col not in cols_to_save:
-                cols_to_save.append(col)
-                print(f"✅ Автоматически добавлен столбец после 'Пассивный словарный запас': {col}")
-    
-    # Формируем итоговый список столбцов в правильном порядке:
+    # Итоговый порядок столбцов:
     # 1. Все столбцы из columns_to_keep в том порядке, в котором они указаны (если они есть в файле)
     # 2. Все остальные столбцы после "Пассивный словарный запас" в том порядке, в котором они идут в файле
-    ordered_cols = []
+    available = set(df.columns.intersection(columns_to_keep, sort=False))
+    ordered_cols = [col for col in columns_to_keep if col in available]
+    missing_from_list = [col for col in columns_to_keep if col not in available]
+    available_count = len(ordered_cols)
     
-    # Сначала добавляем столбцы из columns_to_keep до "Пассивный словарный запас" включительно
-    for col in columns_to_keep:
-        if col in cols_to_save and col not in ordered_cols:
-            ordered_cols.append(col)
-    
-    # Затем добавляем все столбцы после "Пассивный словарный запас", которые есть в файле
     if "Пассивный словарный запас" in df.columns:
-        passive_idx = list(df.columns).index("Пассивный словарный запас")
-        cols_after = list(df.columns[passive_idx + 1:])
-        for col in cols_after:
-            if col not in ordered_cols:
+        passive_idx = df.columns.get_loc("Пассивный словарный запас")
+        for col in df.columns[passive_idx + 1:]:
+            if col not in available:
+                available.add(col)
                 ordered_cols.append(col)
+                print(f"✅ Автоматически добавлен столбец после 'Пассивный словарный запас': {col}")
+    
+    # Сужаем таблицу до фильтрации, чтобы строковые операции шли по меньшему DataFrame.
+    # Обязательные столбцы нужны фильтрам, даже если их нет в итоговом списке.
+    filter_only_cols = [col for col in required_cols if col not in available]
+    df = df[ordered_cols + filter_only_cols]
+    df = clean_and_filter(df, target_university)
+    df = keep_latest_records(df)
     
     # Если есть столбцы из columns_to_keep, которых не нашли, выводим предупреждение
     if missing_from_list:
@@ -148,7 +170,7 @@ def preprocess_excel(
         for col in missing_from_list:
             print(f"   - {col}")
     
-    print(f"\n✅ Сохраняем {len(ordered_cols)} столбцов (из них {len(available_from_list)} из запрошенного списка)")
+    print(f"\n✅ Сохраняем {len(ordered_cols)} столбцов (из них {available_count} из запрошенного списка)")
     
     # Сохраняем DataFrame с выбранными столбцами
     df = df[ordered_cols]
@@ -14,6 +14,7 @@ from src.core.database.connection import engine
 from src.core.database.models import Clusters, Directions
 from src.recommendation.students import clusterize_directions
 
+from .data_utils import read_excel_cached
 from .preprocess_excel import FILTERED_FILE, preprocess_excel
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -42,12 +43,14 @@ def insert_clusters_and_directions(
         )
 
         cluster_ids: dict[int, str] = {}
-        unique_cluster_labels = sorted(set(int(lbl) for lbl in final_labels))
+        # Метки сравниваются одной векторной операцией на кластер, без Python-цикла по всем направлениям
+        labels = np.asarray(final_labels, dtype=np.int64)
+        unique_cluster_labels = np.unique(labels).tolist()
         print(f"\n📦 Создание {len(unique_cluster_labels)} кластеров...")
 
         for cluster_label in unique_cluster_labels:
-            indices = [i for i, lbl in enumerate(final_labels) if int(lbl) == cluster_label]
-            cluster_vectors = embeddings[indices]
+            mask = labels == cluster_label
+            cluster_vectors = embeddings[mask]
             centroid = cluster_vectors.mean(axis=0)
             if centroid.size < embed_dim:
                 centroid = np.pad(centroid, (0, embed_dim - centroid.size))
@@ -59,7 +62,7 @@ def insert_clusters_and_directions(
             cluster_ids[cluster_label] = cluster.id
             print(
                 "   ✅ Создан кластер "
-                f"'{title}' (ID: {cluster.id}, метка: {cluster_label}, направлений: {len(indices)})"
+                f"'{title}' (ID: {cluster.id}, метка: {cluster_label}, направлений: {len(cluster_vectors)})"
             )
 
         print(f"\n✅ Всего создано кластеров: {len(cluster_ids)}")
@@ -134,7 +137,7 @@ def run_directions_pipeline(force_preprocess: bool = True) -> None:
     if not FILTERED_FILE.exists():
         raise FileNotFoundError(f"❌ Не найден файл {FILTERED_FILE}")
 
-    df = pd.read_excel(FILTERED_FILE)
+    df = read_excel_cached(FILTERED_FILE)
     if "Специальность" not in df.columns:
         raise ValueError("❌ В файле отсутствует столбец 'Специальность'")
 
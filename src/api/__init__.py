@@ -1,5 +1,12 @@
+import importlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.exc import SQLAlchemyError
@@ -8,7 +15,7 @@ from src.core.config import settings
 from src.core.logging_config import setup_logging, get_logger
 from src.core.exceptions import BaseAppException
 from src.core.sentry_config import init_sentry
-from .routes import bot_users, students, events, recommendations, feedback, favorites, maintenance
+from src.core.database.connection import POOL_SIZE, MAX_OVERFLOW, engine
 from .middleware.error_handler import (
     base_exception_handler,
     validation_exception_handler,
@@ -17,15 +24,45 @@ from .middleware.error_handler import (
     general_exception_handler,
 )
 
-# Настройка логирования
-setup_logging(
-    level=settings.log_level,
-    service_name="vkr.api"
-)
 logger = get_logger(__name__)
 
-# Инициализация Sentry
-init_sentry()
+# (модуль в src.api.routes, префикс, тег); модули импортируются только при подключении
+ROUTER_SPECS = (
+    ("bot_users", "/bot", "bot"),
+    ("students", "/students", "students"),
+    ("events", "/events", "events"),
+    ("recommendations", "/recommendations", "recommendations"),
+    ("feedback", "/feedback", "feedback"),
+    ("favorites", "/favorites", "favorites"),
+    ("maintenance", "/maintenance", "maintenance"),
+)
+
+_INITIALIZED = False
+
+
+def _init_observability() -> None:
+    """Настраивает логирование и Sentry один раз на процесс."""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    setup_logging(
+        level=settings.log_level,
+        service_name="vkr.api"
+    )
+    init_sentry()
+    _INITIALIZED = True
+
+
+_init_observability()
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Sync-эндпоинты выполняются в пуле потоков AnyIO (по умолчанию 40 потоков).
+    # Выравниваем его с пулом соединений БД, чтобы запросы не упирались в потоки раньше, чем в соединения.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, POOL_SIZE + MAX_OVERFLOW)
+    yield
 
 
 def create_app() -> FastAPI:
@@ -33,8 +70,12 @@ def create_app() -> FastAPI:
         title="Internal VKR API",
         description="Внутреннее API для бота, админ-панели и фоновых сервисов",
         version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=_lifespan,
     )
 
+    # Списки студентов и рекомендаций (UUID, даты) хорошо сжимаются; мелкие ответы отдаются как есть
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.admin_cors_origins,
@@ -50,18 +91,30 @@ def create_app() -> FastAPI:
     app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
     app.add_exception_handler(Exception, general_exception_handler)
 
-    app.include_router(bot_users.router, prefix="/bot", tags=["bot"])
-    app.include_router(students.router, prefix="/students", tags=["students"])
-    app.include_router(events.router, prefix="/events", tags=["events"])
-    app.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
-    app.include_router(feedback.router, prefix="/feedback", tags=["feedback"])
-    app.include_router(favorites.router, prefix="/favorites", tags=["favorites"])
-    app.include_router(maintenance.router, prefix="/maintenance", tags=["maintenance"])
+    # Отключенные роутеры не импортируются вовсе (maintenance тянет pandas, FAISS и скрипты)
+    enabled_routers = settings.enabled_routers
+    for module_name, prefix, tag in ROUTER_SPECS:
+        if enabled_routers is not None and module_name not in enabled_routers:
+            continue
+        module = importlib.import_module(f"{__name__}.routes.{module_name}")
+        app.include_router(module.router, prefix=prefix, tags=[tag])
 
     @app.get("/health", tags=["service"])
     def health_check() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/health/db-pool", tags=["service"])
+    def db_pool_status() -> dict[str, int]:
+        """Состояние пула соединений: сколько соединений свободно, занято и открыто сверх pool_size."""
+        pool = engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": MAX_OVERFLOW,
+        }
+
     logger.info("FastAPI приложение создано и настроено")
     return app
 
@@ -1,10 +1,9 @@
 import uvicorn
 
-from . import create_app
+from . import app
 
 
 def main() -> None:
-    app = create_app()
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
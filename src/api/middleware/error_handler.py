@@ -2,10 +2,9 @@
 Централизованный обработчик ошибок для FastAPI.
 """
 import logging
-import traceback
 from typing import Union
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.exc import SQLAlchemyError
@@ -17,10 +16,11 @@ from src.core.exceptions import BaseAppException
 logger = logging.getLogger(__name__)
 
 
-async def base_exception_handler(request: Request, exc: BaseAppException) -> JSONResponse:
+async def base_exception_handler(request: Request, exc: BaseAppException) -> ORJSONResponse:
     """Обработчик для базовых исключений приложения."""
     logger.error(
-        f"Application error: {exc.message}",
+        "Application error: %s",
+        exc.message,
         extra={
             "error_type": type(exc).__name__,
             "status_code": exc.status_code,
@@ -31,7 +31,7 @@ async def base_exception_handler(request: Request, exc: BaseAppException) -> JSO
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
@@ -42,11 +42,12 @@ async def base_exception_handler(request: Request, exc: BaseAppException) -> JSO
     )
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
     """Обработчик ошибок валидации Pydantic."""
     errors = exc.errors()
     logger.warning(
-        f"Validation error: {errors}",
+        "Validation error: %s",
+        errors,
         extra={
             "path": request.url.path,
             "method": request.method,
@@ -54,7 +55,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": True,
@@ -65,10 +66,12 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ORJSONResponse:
     """Обработчик HTTP исключений."""
     logger.warning(
-        f"HTTP error: {exc.status_code} - {exc.detail}",
+        "HTTP error: %s - %s",
+        exc.status_code,
+        exc.detail,
         extra={
             "status_code": exc.status_code,
             "path": request.url.path,
@@ -76,7 +79,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
@@ -86,10 +89,11 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
     )
 
 
-async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
+async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError) -> ORJSONResponse:
     """Обработчик ошибок SQLAlchemy."""
     logger.error(
-        f"Database error: {str(exc)}",
+        "Database error: %s",
+        exc,
         extra={
             "error_type": type(exc).__name__,
             "path": request.url.path,
@@ -98,7 +102,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError) -
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": True,
@@ -108,7 +112,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError) -
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Обработчик для всех необработанных исключений."""
     # Отправляем в Sentry
     sentry_sdk.capture_exception(
@@ -123,17 +127,18 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
     )
     
     logger.critical(
-        f"Unhandled exception: {type(exc).__name__}: {str(exc)}",
+        "Unhandled exception: %s: %s",
+        type(exc).__name__,
+        exc,
         extra={
             "error_type": type(exc).__name__,
             "path": request.url.path,
             "method": request.method,
-            "traceback": traceback.format_exc(),
         },
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": True,
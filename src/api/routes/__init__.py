@@ -1,4 +1,6 @@
-from . import bot_users, students, events, recommendations, feedback, favorites, maintenance
+"""
+Роутеры API. Модули подключаются лениво в ``src.api.create_app`` по ``ROUTER_SPECS``.
+"""
 
 __all__ = [
     "bot_users",
@@ -9,4 +11,3 @@ __all__ = [
     "favorites",
     "maintenance",
 ]
-
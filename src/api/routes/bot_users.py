@@ -1,3 +1,6 @@
+import threading
+from datetime import datetime, timedelta
+
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
@@ -10,11 +13,46 @@ from src.core.database.crud import bot_users as bot_users_crud
 
 router = APIRouter()
 
+BOT_USER_CACHE_TTL = timedelta(seconds=60)
+BOT_USER_CACHE_MAXSIZE = 10_000
+
+# telegram_id -> (время записи, готовая схема); бот регулярно запрашивает своих пользователей
+_bot_user_cache: dict[int, tuple[datetime, BotUserSchema]] = {}
+# Синхронные эндпоинты выполняются в нескольких потоках пула FastAPI — запись и вытеснение под блокировкой
+_bot_user_cache_lock = threading.Lock()
+
+
+def _get_cached_bot_user(telegram_id: int, now: datetime) -> BotUserSchema | None:
+    cache_entry = _bot_user_cache.get(telegram_id)
+    if cache_entry and now - cache_entry[0] < BOT_USER_CACHE_TTL:
+        return cache_entry[1]
+    return None
+
 
+def _store_bot_user_cache(telegram_id: int, schema: BotUserSchema, now: datetime) -> None:
+    with _bot_user_cache_lock:
+        _bot_user_cache.pop(telegram_id, None)
+        if len(_bot_user_cache) >= BOT_USER_CACHE_MAXSIZE:
+            # Словарь хранит порядок вставки — вытесняем самую старую запись
+            _bot_user_cache.pop(next(iter(_bot_user_cache)), None)
+        _bot_user_cache[telegram_id] = (now, schema)
+
+
+def clear_bot_user_cache(telegram_id: int | None = None) -> None:
+    """Сбросить кэш схем пользователей бота (целиком или для одного telegram_id)."""
+    with _bot_user_cache_lock:
+        if telegram_id is None:
+            _bot_user_cache.clear()
+        else:
+            _bot_user_cache.pop(telegram_id, None)
+
+
+# Схемы собираются из строк ORM, типы которых уже соответствуют полям, поэтому
+# используется model_construct без повторной валидации; ответ проверяется по response_model.
 def _build_direction_schema(direction: Directions | None) -> DirectionSchema | None:
     if not direction:
         return None
-    return DirectionSchema(
+    return DirectionSchema.model_construct(
         id=direction.id,
         title=direction.title,
         cluster_id=direction.cluster_id,
@@ -24,7 +62,7 @@ def _build_direction_schema(direction: Directions | None) -> DirectionSchema | N
 def _build_student_schema(student: Students | None) -> StudentSchema | None:
     if not student:
         return None
-    return StudentSchema(
+    return StudentSchema.model_construct(
         id=student.id,
         participant_id=student.participant_id,
         institution=student.institution,
@@ -33,14 +71,14 @@ def _build_student_schema(student: Students | None) -> StudentSchema | None:
     )
 
 
-def _build_bot_user_schema(bot_user: BotUsers) -> BotUserSchema:
-    return BotUserSchema(
+def _build_bot_user_schema(bot_user: BotUsers, student: StudentSchema | None = None) -> BotUserSchema:
+    return BotUserSchema.model_construct(
         telegram_id=bot_user.telegram_id,
         username=bot_user.username,
         email=bot_user.email,
         is_linked=bot_user.is_linked,
         last_activity=bot_user.last_activity,
-        student=_build_student_schema(bot_user.student),
+        student=student or _build_student_schema(bot_user.student),
     )
 
 
@@ -57,10 +95,17 @@ def _load_bot_user(db: Session, telegram_id: int) -> BotUsers | None:
 
 @router.get("/users/{telegram_id}", response_model=BotUserSchema)
 def get_bot_user(telegram_id: int, db: Session = Depends(db_dependency)) -> BotUserSchema:
+    now = datetime.utcnow()
+    cached = _get_cached_bot_user(telegram_id, now)
+    if cached is not None:
+        return cached
+
     bot_user = _load_bot_user(db, telegram_id)
     if not bot_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bot user not found")
-    return _build_bot_user_schema(bot_user)
+    schema = _build_bot_user_schema(bot_user)
+    _store_bot_user_cache(telegram_id, schema, now)
+    return schema
 
 
 @router.post("/users", response_model=BotUserSchema, status_code=status.HTTP_201_CREATED)
@@ -72,9 +117,11 @@ def create_bot_user(payload: BotUserCreateSchema, db: Session = Depends(db_depen
             detail="Bot user already exists",
         )
 
-    student = db.get(Students, payload.student_id)
+    student = db.get(Students, payload.student_id, options=[selectinload(Students.direction)])
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    # Схему студента строим до commit, пока атрибуты не истекли
+    student_schema = _build_student_schema(student)
 
     bot_user = bot_users_crud.create_bot_user(
         db=db,
@@ -83,9 +130,8 @@ def create_bot_user(payload: BotUserCreateSchema, db: Session = Depends(db_depen
         username=payload.username,
         email=payload.email,
     )
-    db.refresh(bot_user)
-    bot_user.student = student  # type: ignore[assignment]
-    return _build_bot_user_schema(bot_user)
+    clear_bot_user_cache(payload.telegram_id)
+    return _build_bot_user_schema(bot_user, student=student_schema)
 
 
 @router.post("/users/{telegram_id}/activity", status_code=status.HTTP_204_NO_CONTENT)
@@ -94,6 +140,7 @@ def update_activity(telegram_id: int, db: Session = Depends(db_dependency)) -> N
     if not bot_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bot user not found")
     bot_users_crud.update_bot_user_activity(db, telegram_id)
+    clear_bot_user_cache(telegram_id)
 
 
 @router.delete("/users/{telegram_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -102,4 +149,5 @@ def delete_bot_user(telegram_id: int, db: Session = Depends(db_dependency)) -> N
     if not bot_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bot user not found")
     bot_users_crud.delete_bot_user(db, telegram_id)
+    clear_bot_user_cache(telegram_id)
 
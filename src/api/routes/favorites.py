@@ -4,22 +4,27 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from src.api.dependencies import db_dependency
-from src.api.schemas import FavoriteSchema, FavoriteWithEventSchema, EventSchema
+from src.api.schemas import EventBulkRequest, FavoriteSchema, FavoriteWithEventSchema
 from src.core.database.crud.favorites import (
     add_favorite,
     remove_favorite,
     get_favorites_for_student,
+    get_favorite_event_ids,
     is_favorite,
     count_favorites_for_student,
 )
-from src.core.database.crud.events import get_event_by_id
 
 
 router = APIRouter()
 
+# Список с вложенными мероприятиями проверяется и выгружается за один проход в pydantic-core
+_FAVORITES_WITH_EVENT_ADAPTER = TypeAdapter(List[FavoriteWithEventSchema])
+
 
 @router.post("/{student_id}/{event_id}", response_model=FavoriteSchema, status_code=status.HTTP_201_CREATED)
 def add_favorite_endpoint(
@@ -57,26 +62,13 @@ def get_favorites_for_student_endpoint(
     student_id: UUID,
     limit: int = 100,
     db: Session = Depends(db_dependency),
-) -> List[FavoriteWithEventSchema]:
+) -> ORJSONResponse:
     """Получить все избранные мероприятия студента с полной информацией о мероприятиях."""
     favorites = get_favorites_for_student(db, student_id=student_id, limit=limit)
-    
-    result = []
-    for favorite in favorites:
-        event = get_event_by_id(db, favorite.event_id)
-        if event:
-            result.append(
-                FavoriteWithEventSchema(
-                    id=favorite.id,
-                    student_id=favorite.student_id,
-                    event_id=favorite.event_id,
-                    created_at=favorite.created_at,
-                    event=EventSchema.model_validate(event)
-                )
-            )
-        # Если мероприятие удалено, пропускаем его (можно было бы удалить из favorites, но оставляем для истории)
-    
-    return result
+    # Мероприятия уже подгружены JOIN-ом; избранное без мероприятия в выборку не попадает.
+    # Ответ отдаётся напрямую через orjson, без повторной проверки по response_model
+    items = _FAVORITES_WITH_EVENT_ADAPTER.validate_python(favorites, from_attributes=True)
+    return ORJSONResponse(_FAVORITES_WITH_EVENT_ADAPTER.dump_python(items))
 
 
 @router.get("/by-student/{student_id}/count", response_model=dict)
@@ -89,6 +81,17 @@ def get_favorites_count_endpoint(
     return {"student_id": str(student_id), "count": count}
 
 
+@router.post("/by-student/{student_id}/check", response_model=dict)
+def check_favorites_bulk_endpoint(
+    student_id: UUID,
+    payload: EventBulkRequest,
+    db: Session = Depends(db_dependency),
+) -> dict:
+    """Проверить сразу несколько мероприятий: вернуть те из них, что находятся в избранном."""
+    event_ids = get_favorite_event_ids(db, student_id=student_id, event_ids=list(payload.ids))
+    return {"student_id": str(student_id), "event_ids": [str(event_id) for event_id in event_ids]}
+
+
 @router.get("/{student_id}/{event_id}/check", response_model=dict)
 def check_favorite_endpoint(
     student_id: UUID,
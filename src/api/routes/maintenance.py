@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import functools
 import io
+import os
 import shutil
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Literal
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from src.api.dependencies import db_dependency
+from src.api.routes.bot_users import clear_bot_user_cache
 from src.core.database.reset_database import reset_database
 from src.recommendation.events.score_calculation import recalculate_scores_for_all_students
 from src.recommendation.events.utils import (
+    EVENT_INSERT_MODES,
     insert_events_to_db,
     load_events_from_json_file,
     process_events_from_csv,
@@ -63,6 +72,7 @@ class EventsLoadRequest(BaseModel):
     assign_clusters: bool = False
     cluster_top_k: int | None = Field(None, ge=1)
     similarity_threshold: float | None = Field(None, ge=0.0, le=1.0)
+    insert_mode: Literal["bulk", "row"] = "bulk"
 
 
 class EventsLoadResponse(BaseModel):
@@ -76,9 +86,18 @@ class EventsLoadResponse(BaseModel):
     log: str | None = None
 
 
+# Операции обслуживания всё равно выполняются по одной (MAINTENANCE_EXECUTOR с одним потоком),
+# флаг влияет только на перехват вывода
+_CAPTURE_LOG_DESCRIPTION = (
+    "Перехватывать stdout операции и возвращать его в поле log. "
+    "false отключает подмену sys.stdout и буферизацию лога; параллельно операции от этого не выполняются"
+)
+
+
 class RecommendationsRecalculateRequest(BaseModel):
     min_score: float = Field(0.0, ge=0.0, le=1.0)
     batch_size: int = Field(1000, ge=1)
+    capture_log: bool = Field(True, description=_CAPTURE_LOG_DESCRIPTION)
 
 
 class RecommendationsRecalculateResponse(BaseModel):
@@ -101,6 +120,7 @@ class DirectionsPreprocessResponse(BaseModel):
 
 class DirectionsClusterRequest(BaseModel):
     force_preprocess: bool = False
+    capture_log: bool = Field(True, description=_CAPTURE_LOG_DESCRIPTION)
 
 
 class DirectionsClusterResponse(BaseModel):
@@ -110,6 +130,7 @@ class DirectionsClusterResponse(BaseModel):
 
 class ResetDatabaseRequest(BaseModel):
     confirm: bool = False
+    capture_log: bool = Field(True, description=_CAPTURE_LOG_DESCRIPTION)
 
 
 class ResetDatabaseResponse(BaseModel):
@@ -126,8 +147,41 @@ class OperationExecutionError(Exception):
         self.log = log
 
 
-def _execute_with_logs(func, *args, **kwargs) -> tuple[object, str]:
-    buffer = io.StringIO()
+LOG_SINK_MAX_WRITES = 10_000
+
+
+class _BoundedLogSink(io.TextIOBase):
+    """Текстовый поток для redirect_stdout, который хранит только последние записи."""
+
+    def __init__(self, max_writes: int = LOG_SINK_MAX_WRITES):
+        self._buf: deque[str] = deque(maxlen=max_writes)
+        self.dropped = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if len(self._buf) == self._buf.maxlen:
+            self.dropped += 1
+        self._buf.append(s)
+        return len(s)
+
+    def getvalue(self) -> str:
+        text = "".join(self._buf)
+        if self.dropped:
+            return f"... (пропущено ранних записей лога: {self.dropped})\n{text}"
+        return text
+
+
+def _execute_with_logs(func, *args, capture: bool = True, **kwargs) -> tuple[object, str]:
+    if not capture:
+        # Без перехвата не подменяем sys.stdout и не буферизуем лог — вывод идёт прямо в stdout процесса
+        try:
+            return func(*args, **kwargs), ""
+        except Exception as exc:  # noqa: BLE001 - same error contract as with capture
+            raise OperationExecutionError(exc, "") from exc
+
+    buffer = _BoundedLogSink()
     try:
         with contextlib.redirect_stdout(buffer):
             result = func(*args, **kwargs)
@@ -136,6 +190,123 @@ def _execute_with_logs(func, *args, **kwargs) -> tuple[object, str]:
     return result, buffer.getvalue()
 
 
+# Отдельный пул для долгих операций обслуживания, чтобы они не занимали общий пул потоков FastAPI.
+# Один поток: перехват лога подменяет общий для процесса sys.stdout, и параллельные операции
+# перемешали бы логи друг друга
+MAINTENANCE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="maintenance")
+
+
+@contextlib.asynccontextmanager
+async def _upload_tmpdir():
+    """Временная директория для загрузки одного запроса; удаляется вместе с файлом после ответа."""
+    # Создание и удаление (rmtree загруженного файла) выполняются в потоке, чтобы не блокировать event loop
+    tmpdir = await asyncio.to_thread(tempfile.TemporaryDirectory, prefix="vkr_maintenance_")
+    try:
+        yield Path(tmpdir.name)
+    finally:
+        await asyncio.to_thread(tmpdir.cleanup)
+
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Эндпоинты принимают один файл и несколько параметров; остальное отклоняется при разборе формы
+UPLOAD_MAX_FILES = 1
+UPLOAD_MAX_FIELDS = 32
+
+
+def _upload_fileno(source) -> int | None:
+    """Дескриптор файла загрузки, если данные уже лежат на диске."""
+    # SpooledTemporaryFile.fileno() принудительно сбрасывает буфер из памяти на диск,
+    # поэтому для небольших загрузок, ещё не вытесненных на диск, дескриптор не берём
+    if isinstance(source, tempfile.SpooledTemporaryFile) and not getattr(source, "_rolled", False):
+        return None
+    try:
+        return source.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _sendfile_upload(source_fd: int, destination) -> bool:
+    """Копирует файл средствами ядра (os.sendfile) без прохода данных через Python."""
+    offset = 0
+    try:
+        while sent := os.sendfile(destination.fileno(), source_fd, offset, UPLOAD_CHUNK_SIZE):
+            offset += sent
+    except OSError:
+        # Например, на macOS sendfile работает только с сокетами
+        destination.seek(0)
+        destination.truncate()
+        return False
+    return True
+
+
+def _copy_upload(source, target: Path) -> None:
+    source.seek(0)
+    source_fd = _upload_fileno(source) if hasattr(os, "sendfile") else None
+    with target.open("wb") as destination:
+        if source_fd is not None and _sendfile_upload(source_fd, destination):
+            return
+        shutil.copyfileobj(source, destination, UPLOAD_CHUNK_SIZE)
+
+
+async def _save_upload(file, default_filename: str, tmpdir: Path) -> Path:
+    """Потоково сохраняет загруженный файл во временную директорию, не читая его целиком в память."""
+    filename = Path(getattr(file, "filename", default_filename) or default_filename).name
+    target = tmpdir / filename
+    # Запись на диск выполняется в потоке, чтобы не блокировать event loop
+    await asyncio.to_thread(_copy_upload, file.file, target)
+    return target
+
+
+def _reported_input(upload_path: Path | None, input_path: Path) -> str:
+    """Путь к входному файлу для ответа.
+
+    Загрузка живёт во временной директории запроса и удаляется вместе с ней,
+    поэтому для неё возвращается только исходное имя файла, а не путь.
+    """
+    return upload_path.name if upload_path else str(input_path)
+
+
+_MULTIPART_CONTENT_TYPE = b"multipart/form-data"
+
+
+def _is_multipart(request: Request) -> bool:
+    """Проверяет content-type по сырым заголовкам Starlette, без декодирования и lower() всей строки."""
+    for key, value in request.headers.raw:
+        if key == b"content-type":
+            return value[:len(_MULTIPART_CONTENT_TYPE)].lower() == _MULTIPART_CONTENT_TYPE
+    return False
+
+
+async def _parse_upload(request: Request, default_filename: str, tmpdir: Path) -> tuple[Path | None, dict]:
+    """Разбирает multipart- или JSON-запрос.
+
+    Возвращает путь к сохранённому загруженному файлу (или None) и остальные поля запроса.
+    """
+    if _is_multipart(request):
+        # Starlette пишет файловую часть в SpooledTemporaryFile (на диск после 1 МБ);
+        # после копирования в рабочую директорию форма закрывается, не дожидаясь конца запроса
+        async with request.form(max_files=UPLOAD_MAX_FILES, max_fields=UPLOAD_MAX_FIELDS) as form:
+            file = form.get("file")
+            params = {key: value for key, value in form.items() if key != "file"}
+            upload_path = await _save_upload(file, default_filename, tmpdir) if file else None
+        return upload_path, params
+
+    # По умолчанию пытаемся парсить как JSON; если не JSON, используем значения по умолчанию
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        body = None
+    return None, body if isinstance(body, dict) else {}
+
+
+async def _run_with_logs(func, *args, capture: bool = True, **kwargs) -> tuple[object, str]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        MAINTENANCE_EXECUTOR,
+        functools.partial(_execute_with_logs, func, *args, capture=capture, **kwargs),
+    )
+
+
 def _http_error_from_exception(exc: OperationExecutionError, not_found_types: tuple[type[Exception], ...] = (FileNotFoundError,)) -> HTTPException:
     status_code = (
         status.HTTP_404_NOT_FOUND
@@ -148,197 +319,157 @@ def _http_error_from_exception(exc: OperationExecutionError, not_found_types: tu
     return HTTPException(status_code=status_code, detail=detail)
 
 
+# Пути и значения по умолчанию — константы модулей, поэтому ответ /info собирается один раз при импорте
+_MAINTENANCE_INFO = MaintenanceInfoResponse(
+    events_input_file=str(Path(EVENTS_INPUT_FILE)),
+    events_output_file=str(Path(EVENTS_OUTPUT_FILE)),
+    directions_input_file=str(Path(DIRECTIONS_INPUT_FILE)),
+    directions_output_file=str(Path(DIRECTIONS_OUTPUT_FILE)),
+    cluster_top_k_default=CLUSTER_TOP_K,
+    similarity_threshold_default=SIMILARITY_THRESHOLD,
+)
+
+
 @router.get("/info", response_model=MaintenanceInfoResponse)
 def get_maintenance_info() -> MaintenanceInfoResponse:
-    return MaintenanceInfoResponse(
-        events_input_file=str(Path(EVENTS_INPUT_FILE)),
-        events_output_file=str(Path(EVENTS_OUTPUT_FILE)),
-        directions_input_file=str(Path(DIRECTIONS_INPUT_FILE)),
-        directions_output_file=str(Path(DIRECTIONS_OUTPUT_FILE)),
-        cluster_top_k_default=CLUSTER_TOP_K,
-        similarity_threshold_default=SIMILARITY_THRESHOLD,
-    )
+    return _MAINTENANCE_INFO
 
 
 @router.post("/events/process-csv", response_model=EventsProcessResponse)
 async def process_events_csv(request: Request) -> EventsProcessResponse:
     """Обрабатывает CSV файл мероприятий. Можно загрузить файл или указать путь."""
     _ensure_event_paths()
+
+    async with _upload_tmpdir() as tmpdir:
+        upload_path, params = await _parse_upload(request, "uploaded.csv", tmpdir)
+        input_file = params.get("input_file")
+        output_file = params.get("output_file")
+
+        # Определяем входной файл
+        if upload_path:
+            input_path = upload_path
+        elif input_file:
+            input_path = Path(input_file)
+        else:
+            input_path = Path(EVENTS_INPUT_FILE)
     
-    content_type = request.headers.get("content-type", "").lower()
-    file = None
-    input_file = None
-    output_file = None
-    
-    # Парсим запрос в зависимости от content-type
-    if "multipart/form-data" in content_type:
-        form = await request.form()
-        if "file" in form:
-            file = form["file"]
-        input_file = form.get("input_file")
-        output_file = form.get("output_file")
-    else:
-        # По умолчанию пытаемся парсить как JSON
-        try:
-            body = await request.json()
-            input_file = body.get("input_file")
-            output_file = body.get("output_file")
-        except Exception:
-            # Если не JSON, используем значения по умолчанию
-            pass
-    
-    # Определяем входной файл
-    if file:
-        # Сохраняем загруженный файл во временную директорию
-        temp_dir = Path(tempfile.gettempdir()) / "vkr_events"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        filename = getattr(file, "filename", "uploaded.csv") or "uploaded.csv"
-        input_path = temp_dir / filename
-        file_content = await file.read()
-        with input_path.open("wb") as f:
-            f.write(file_content)
-    elif input_file:
-        input_path = Path(input_file)
-    else:
-        input_path = Path(EVENTS_INPUT_FILE)
+        # Определяем выходной файл
+        if output_file:
+            output_path = Path(output_file)
+        else:
+            output_path = Path(EVENTS_OUTPUT_FILE)
     
-    # Определяем выходной файл
-    if output_file:
-        output_path = Path(output_file)
-    else:
-        output_path = Path(EVENTS_OUTPUT_FILE)
+        # Создаём директорию для выходного файла
+        output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Создаём директорию для выходного файла
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not input_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Файл не найден: {input_path}",
+            )
     
-    if not input_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Файл не найден: {input_path}",
+        try:
+            events, log = await _run_with_logs(process_events_from_csv, input_path, output_path)
+        except OperationExecutionError as exc:
+            raise _http_error_from_exception(exc)
+
+        return EventsProcessResponse(
+            processed=len(events),
+            input_file=_reported_input(upload_path, input_path),
+            output_file=str(output_path),
+            log=log or None,
         )
-    
-    try:
-        events, log = _execute_with_logs(process_events_from_csv, input_path, output_path)
-    except OperationExecutionError as exc:
-        raise _http_error_from_exception(exc)
-
-    return EventsProcessResponse(
-        processed=len(events),
-        input_file=str(input_path),
-        output_file=str(output_path),
-        log=log or None,
-    )
 
 
 @router.post("/events/load-json", response_model=EventsLoadResponse)
 async def load_events_from_json(request: Request) -> EventsLoadResponse:
     """Загружает мероприятия из JSON в БД. Можно загрузить файл или указать путь."""
     _ensure_event_paths()
-    
-    content_type = request.headers.get("content-type", "").lower()
-    file = None
-    input_file = None
-    assign_clusters = False
-    cluster_top_k = None
-    similarity_threshold = None
-    
-    # Парсим запрос в зависимости от content-type
-    if "multipart/form-data" in content_type:
-        form = await request.form()
-        if "file" in form:
-            file = form["file"]
-        input_file = form.get("input_file")
-        assign_clusters = form.get("assign_clusters", "false").lower() == "true"
-        if form.get("cluster_top_k"):
-            cluster_top_k = int(form["cluster_top_k"])
-        if form.get("similarity_threshold"):
-            similarity_threshold = float(form["similarity_threshold"])
-    else:
-        # По умолчанию пытаемся парсить как JSON
-        try:
-            body = await request.json()
-            input_file = body.get("input_file")
-            assign_clusters = body.get("assign_clusters", False)
-            cluster_top_k = body.get("cluster_top_k")
-            similarity_threshold = body.get("similarity_threshold")
-        except Exception:
-            # Если не JSON, используем значения по умолчанию
-            pass
-    
-    # Определяем входной файл
-    json_path = None
-    if file:
-        # Сохраняем загруженный файл во временную директорию
-        temp_dir = Path(tempfile.gettempdir()) / "vkr_events"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        filename = getattr(file, "filename", "uploaded.json") or "uploaded.json"
-        json_path = temp_dir / filename
-        file_content = await file.read()
-        with json_path.open("wb") as f:
-            f.write(file_content)
-    elif input_file:
-        json_path = Path(input_file)
-    else:
-        json_path = Path(EVENTS_OUTPUT_FILE)
-    
-    if not json_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"JSON-файл не найден: {json_path}",
-        )
 
-    try:
-        events, load_log = _execute_with_logs(load_events_from_json_file, json_path)
-    except OperationExecutionError as exc:
-        raise _http_error_from_exception(exc)
+    async with _upload_tmpdir() as tmpdir:
+        upload_path, params = await _parse_upload(request, "uploaded.json", tmpdir)
+        input_file = params.get("input_file")
+        assign_clusters = params.get("assign_clusters", False)
+        if isinstance(assign_clusters, str):
+            # Поля формы приходят строками
+            assign_clusters = assign_clusters.lower() == "true"
+        cluster_top_k = int(params["cluster_top_k"]) if params.get("cluster_top_k") else None
+        similarity_threshold = float(params["similarity_threshold"]) if params.get("similarity_threshold") else None
+        insert_mode = params.get("insert_mode") or "bulk"
+        if insert_mode not in EVENT_INSERT_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"insert_mode должен быть одним из: {', '.join(EVENT_INSERT_MODES)}",
+            )
+
+        # Определяем входной файл
+        if upload_path:
+            json_path = upload_path
+        elif input_file:
+            json_path = Path(input_file)
+        else:
+            json_path = Path(EVENTS_OUTPUT_FILE)
+    
+        if not json_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"JSON-файл не найден: {json_path}",
+            )
 
-    if not events:
-        detail = {"message": "JSON-файл не содержит мероприятий"}
-        if load_log:
-            detail["log"] = load_log
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+        try:
+            events, load_log = await _run_with_logs(load_events_from_json_file, json_path)
+        except OperationExecutionError as exc:
+            raise _http_error_from_exception(exc)
+
+        if not events:
+            detail = {"message": "JSON-файл не содержит мероприятий"}
+            if load_log:
+                detail["log"] = load_log
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
     
-    # Получаем параметры из запроса
-    assign_clusters_val = assign_clusters
-    cluster_top_k_val = cluster_top_k or CLUSTER_TOP_K
-    similarity_threshold_val = similarity_threshold or SIMILARITY_THRESHOLD
+        # Получаем параметры из запроса
+        assign_clusters_val = assign_clusters
+        cluster_top_k_val = cluster_top_k or CLUSTER_TOP_K
+        similarity_threshold_val = similarity_threshold or SIMILARITY_THRESHOLD
 
-    try:
-        (added, skipped), insert_log = _execute_with_logs(
-            insert_events_to_db,
-            events,
+        try:
+            (added, skipped), insert_log = await _run_with_logs(
+                insert_events_to_db,
+                events,
+                assign_clusters=assign_clusters_val,
+                cluster_top_k=cluster_top_k_val,
+                similarity_threshold=similarity_threshold_val,
+                insert_mode=insert_mode,
+            )
+        except OperationExecutionError as exc:
+            raise _http_error_from_exception(exc)
+
+        combined_log = "\n".join(part for part in (load_log, insert_log) if part)
+
+        return EventsLoadResponse(
+            added=added,
+            skipped=skipped,
+            total_in_file=len(events),
             assign_clusters=assign_clusters_val,
             cluster_top_k=cluster_top_k_val,
             similarity_threshold=similarity_threshold_val,
+            output_file=_reported_input(upload_path, json_path),
+            log=combined_log or None,
         )
-    except OperationExecutionError as exc:
-        raise _http_error_from_exception(exc)
-
-    combined_log = "\n".join(part for part in (load_log, insert_log) if part)
-
-    return EventsLoadResponse(
-        added=added,
-        skipped=skipped,
-        total_in_file=len(events),
-        assign_clusters=assign_clusters_val,
-        cluster_top_k=cluster_top_k_val,
-        similarity_threshold=similarity_threshold_val,
-        output_file=str(json_path),
-        log=combined_log or None,
-    )
 
 
 @router.post("/recommendations/recalculate", response_model=RecommendationsRecalculateResponse)
-def recalculate_recommendations(
+async def recalculate_recommendations(
     payload: RecommendationsRecalculateRequest,
     db: Session = Depends(db_dependency),
 ) -> RecommendationsRecalculateResponse:
     try:
-        stats, log = _execute_with_logs(
+        stats, log = await _run_with_logs(
             recalculate_scores_for_all_students,
             db,
             min_score=payload.min_score,
             batch_size=payload.batch_size,
+            capture=payload.capture_log,
         )
     except OperationExecutionError as exc:
         raise _http_error_from_exception(exc)
@@ -349,98 +480,63 @@ def recalculate_recommendations(
 @router.post("/directions/preprocess", response_model=DirectionsPreprocessResponse)
 async def preprocess_directions(request: Request) -> DirectionsPreprocessResponse:
     """Предобрабатывает Excel файл направлений. Можно загрузить файл или указать путь."""
-    content_type = request.headers.get("content-type", "").lower()
-    file = None
-    input_file = None
-    output_file = None
-    
-    # Парсим запрос в зависимости от content-type
-    if "multipart/form-data" in content_type:
-        form = await request.form()
-        if "file" in form:
-            file = form["file"]
-        input_file = form.get("input_file")
-        output_file = form.get("output_file")
-    else:
-        # По умолчанию пытаемся парсить как JSON
-        try:
-            body = await request.json()
-            input_file = body.get("input_file")
-            output_file = body.get("output_file")
-        except Exception:
-            # Если не JSON, используем значения по умолчанию
-            pass
+    async with _upload_tmpdir() as tmpdir:
+        upload_path, params = await _parse_upload(request, "uploaded.xlsx", tmpdir)
+        input_file = params.get("input_file")
+        output_file = params.get("output_file")
+
+        # Определяем входной файл
+        if upload_path:
+            input_path = upload_path
+        elif input_file:
+            input_path = Path(input_file)
+        else:
+            input_path = Path(DIRECTIONS_INPUT_FILE)
     
-    # Определяем входной файл
-    if file:
-        # Сохраняем загруженный файл во временную директорию
-        temp_dir = Path(tempfile.gettempdir()) / "vkr_directions"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        filename = getattr(file, "filename", "uploaded.xlsx") or "uploaded.xlsx"
-        input_path = temp_dir / filename
-        file_content = await file.read()
-        with input_path.open("wb") as f:
-            f.write(file_content)
-    elif input_file:
-        input_path = Path(input_file)
-    else:
-        input_path = Path(DIRECTIONS_INPUT_FILE)
+        # Определяем выходной файл
+        if output_file:
+            output_path = Path(output_file)
+        else:
+            output_path = Path(DIRECTIONS_OUTPUT_FILE)
     
-    # Определяем выходной файл
-    if output_file:
-        output_path = Path(output_file)
-    else:
-        output_path = Path(DIRECTIONS_OUTPUT_FILE)
+        # Создаём директорию для выходного файла
+        output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Создаём директорию для выходного файла
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not input_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Файл не найден: {input_path}",
+            )
     
-    if not input_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Файл не найден: {input_path}",
-        )
-    
-    # Временно переопределяем пути в функции preprocess_excel
-    from scripts.database_mv.helpers.preprocess_excel import preprocess_excel as original_preprocess
-    
-    def preprocess_with_paths():
-        from scripts.database_mv.helpers.preprocess_excel import INPUT_FILE, OUTPUT_FILE
-        # Временно заменяем пути
-        import scripts.database_mv.helpers.preprocess_excel as preprocess_module
-        original_input = preprocess_module.INPUT_FILE
-        original_output = preprocess_module.OUTPUT_FILE
         try:
-            preprocess_module.INPUT_FILE = input_path
-            preprocess_module.OUTPUT_FILE = output_path
-            return original_preprocess()
-        finally:
-            preprocess_module.INPUT_FILE = original_input
-            preprocess_module.OUTPUT_FILE = original_output
-    
-    try:
-        df, log = _execute_with_logs(preprocess_with_paths)
-    except OperationExecutionError as exc:
-        raise _http_error_from_exception(exc)
-
-    rows = int(getattr(df, "shape", (0, 0))[0]) if df is not None else 0
-    columns = int(getattr(df, "shape", (0, 0))[1]) if df is not None else 0
-
-    return DirectionsPreprocessResponse(
-        rows=rows,
-        columns=columns,
-        input_file=str(input_path),
-        output_file=str(output_path),
-        log=log or None,
-    )
+            df, log = await _run_with_logs(preprocess_excel, input_path, output_path)
+        except OperationExecutionError as exc:
+            raise _http_error_from_exception(exc)
+
+        rows = int(getattr(df, "shape", (0, 0))[0]) if df is not None else 0
+        columns = int(getattr(df, "shape", (0, 0))[1]) if df is not None else 0
+
+        return DirectionsPreprocessResponse(
+            rows=rows,
+            columns=columns,
+            input_file=_reported_input(upload_path, input_path),
+            output_file=str(output_path),
+            log=log or None,
+        )
 
 
 @router.post("/directions/clusterize", response_model=DirectionsClusterResponse)
-def clusterize_directions(request: DirectionsClusterRequest) -> DirectionsClusterResponse:
+async def clusterize_directions(request: DirectionsClusterRequest) -> DirectionsClusterResponse:
     try:
-        _, log = _execute_with_logs(run_directions_pipeline, force_preprocess=request.force_preprocess)
+        _, log = await _run_with_logs(
+            run_directions_pipeline,
+            force_preprocess=request.force_preprocess,
+            capture=request.capture_log,
+        )
     except OperationExecutionError as exc:
         raise _http_error_from_exception(exc)
+    # Направления и кластеры пересозданы — закэшированные схемы пользователей бота устарели
+    clear_bot_user_cache()
 
     message = (
         "Кластеризация направлений выполнена (с предварительной обработкой)."
@@ -452,7 +548,7 @@ def clusterize_directions(request: DirectionsClusterRequest) -> DirectionsCluste
 
 
 @router.post("/database/reset", response_model=ResetDatabaseResponse)
-def reset_database_endpoint(request: ResetDatabaseRequest) -> ResetDatabaseResponse:
+async def reset_database_endpoint(request: ResetDatabaseRequest) -> ResetDatabaseResponse:
     if not request.confirm:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -460,9 +556,11 @@ def reset_database_endpoint(request: ResetDatabaseRequest) -> ResetDatabaseRespo
         )
 
     try:
-        _, log = _execute_with_logs(reset_database)
+        _, log = await _run_with_logs(reset_database, capture=request.capture_log)
     except OperationExecutionError as exc:
         raise _http_error_from_exception(exc)
+    # bot_users и students очищены — кэш не должен отдавать удалённых пользователей
+    clear_bot_user_cache()
 
     return ResetDatabaseResponse(message="База данных сброшена.", log=log or None)
 
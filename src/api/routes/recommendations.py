@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from src.api.dependencies import db_dependency
-from src.api.schemas import RecommendationSchema
-from src.core.database.crud.recommendations import get_recommendations_for_student, delete_recommendation
+from src.api.schemas import RecommendationSchema, RecommendationWithEventSchema
+from src.core.database.connection import SessionLocal
+from src.core.database.crud.recommendations import (
+    get_recommendations_for_student,
+    get_recommendations_with_events_for_student,
+    delete_recommendation,
+)
 from src.recommendation.events.score_calculation import (
     recalculate_scores_for_all_students,
     recalculate_scores_for_student,
@@ -17,15 +24,45 @@ from src.recommendation.events.score_calculation import (
 
 router = APIRouter()
 
+# Рекомендации с вложенными мероприятиями проверяются и выгружаются за один проход в pydantic-core
+_RECOMMENDATIONS_WITH_EVENT_ADAPTER = TypeAdapter(List[RecommendationWithEventSchema])
+
 
 @router.get("/by-student/{student_id}", response_model=list[RecommendationSchema])
 def list_recommendations_for_student(
     student_id: UUID,
     limit: int = 10,
+    offset: int = 0,
+    db: Session = Depends(db_dependency),
+) -> ORJSONResponse:
+    recommendations = get_recommendations_for_student(db, student_id=student_id, limit=limit, offset=offset)
+    # Строки приходят из ORM с уже корректными типами — отдаём их напрямую через orjson,
+    # без повторной валидации и сериализации по response_model
+    return ORJSONResponse([
+        {
+            "id": rec.id,
+            "student_id": rec.student_id,
+            "event_id": rec.event_id,
+            "score": rec.score,
+            "created_at": rec.created_at,
+        }
+        for rec in recommendations
+    ])
+
+
+@router.get("/by-student/{student_id}/with-events", response_model=List[RecommendationWithEventSchema])
+def list_recommendations_with_events_for_student(
+    student_id: UUID,
+    limit: int = 10,
+    offset: int = 0,
     db: Session = Depends(db_dependency),
-) -> list[RecommendationSchema]:
-    recommendations = get_recommendations_for_student(db, student_id=student_id, limit=limit)
-    return [RecommendationSchema.model_validate(rec) for rec in recommendations]
+) -> ORJSONResponse:
+    """Страница рекомендаций вместе с мероприятиями, чтобы клиенту не догружать их отдельно."""
+    recommendations = get_recommendations_with_events_for_student(
+        db, student_id=student_id, limit=limit, offset=offset
+    )
+    items = _RECOMMENDATIONS_WITH_EVENT_ADAPTER.validate_python(recommendations, from_attributes=True)
+    return ORJSONResponse(_RECOMMENDATIONS_WITH_EVENT_ADAPTER.dump_python(items))
 
 
 @router.post("/recalculate", response_model=dict)
@@ -38,12 +75,27 @@ def recalculate_all_recommendations(
     return stats
 
 
+def _recalculate_student_in_background(student_id: UUID, min_score: float) -> None:
+    # Сессия запроса к этому моменту уже закрыта, поэтому фоновая задача открывает свою
+    with SessionLocal() as db:
+        recalculate_scores_for_student(db, student_id=student_id, min_score=min_score)
+
+
 @router.post("/by-student/{student_id}/recalculate", response_model=dict)
 def recalculate_recommendations_for_student(
     student_id: UUID,
+    response: Response,
+    background_tasks: BackgroundTasks,
     min_score: float = 0.0,
+    background: bool = False,
     db: Session = Depends(db_dependency),
 ) -> dict:
+    if background:
+        # Пересчёт запускается после отправки ответа; клиент не ждёт его завершения
+        background_tasks.add_task(_recalculate_student_in_background, student_id, min_score)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"status": "scheduled"}
+
     stats = recalculate_scores_for_student(db, student_id=student_id, min_score=min_score)
     return stats
 
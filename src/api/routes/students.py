@@ -1,8 +1,11 @@
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func
-from sqlalchemy.orm import Session, selectinload
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from src.api.dependencies import db_dependency
 from src.api.schemas import StudentSchema, DirectionSchema, StudentListResponse
@@ -11,11 +14,14 @@ from src.core.database.models import Students, Directions
 
 router = APIRouter()
 
+# Список проверяется и выгружается в dict целиком в pydantic-core, без Python-вызова на каждую строку
+_STUDENT_LIST_ADAPTER = TypeAdapter(list[StudentSchema])
+
 
 def _build_direction(direction: Directions | None) -> DirectionSchema | None:
     if not direction:
         return None
-    return DirectionSchema(
+    return DirectionSchema.model_construct(
         id=direction.id,
         title=direction.title,
         cluster_id=direction.cluster_id,
@@ -23,7 +29,8 @@ def _build_direction(direction: Directions | None) -> DirectionSchema | None:
 
 
 def _build_student(student: Students) -> StudentSchema:
-    return StudentSchema(
+    # Данные из ORM уже типизированы, поэтому схемы собираются без валидации
+    return StudentSchema.model_construct(
         id=student.id,
         participant_id=student.participant_id,
         institution=student.institution,
@@ -35,7 +42,7 @@ def _build_student(student: Students) -> StudentSchema:
 def _load_student_by_participant_id(db: Session, participant_id: str) -> Students | None:
     stmt = (
         select(Students)
-        .options(selectinload(Students.direction))
+        .options(joinedload(Students.direction))
         .where(Students.participant_id == participant_id)
     )
     return db.execute(stmt).scalar_one_or_none()
@@ -53,7 +60,7 @@ def get_student_by_participant(participant_id: str, db: Session = Depends(db_dep
 def get_student(student_id: UUID, db: Session = Depends(db_dependency)) -> StudentSchema:
     stmt = (
         select(Students)
-        .options(selectinload(Students.direction))
+        .options(joinedload(Students.direction))
         .where(Students.id == student_id)
     )
     student = db.execute(stmt).scalar_one_or_none()
@@ -66,21 +73,54 @@ def get_student(student_id: UUID, db: Session = Depends(db_dependency)) -> Stude
 def list_students(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: datetime | None = Query(None, description="created_at последнего студента предыдущей страницы"),
+    cursor_id: UUID | None = Query(None, description="id последнего студента предыдущей страницы"),
     db: Session = Depends(db_dependency),
-) -> StudentListResponse:
-    total = db.execute(select(func.count()).select_from(Students)).scalar_one()
+) -> ORJSONResponse:
+    if (cursor is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="cursor и cursor_id передаются только вместе",
+        )
+
     stmt = (
         select(Students)
         .options(selectinload(Students.direction))
-        .order_by(Students.created_at.desc())
-        .offset(offset)
+        .order_by(Students.created_at.desc(), Students.id.desc())
         .limit(limit)
     )
-    students = db.execute(stmt).scalars().all()
-    return StudentListResponse(
-        students=[_build_student(student) for student in students],
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
-
+    if cursor is not None:
+        # Keyset-пагинация: поиск по индексу (created_at DESC, id DESC) вместо пропуска offset строк.
+        # Окно здесь посчитало бы только строки после курсора, поэтому total — подзапросом по всей таблице
+        total_column = select(func.count()).select_from(Students).scalar_subquery().label("total")
+        stmt = stmt.add_columns(total_column).where(
+            tuple_(Students.created_at, Students.id) < (cursor, cursor_id)
+        )
+        offset = 0
+    else:
+        # Общее число считается оконной функцией в том же запросе, что и страница
+        stmt = stmt.add_columns(func.count().over().label("total")).offset(offset)
+
+    rows = db.execute(stmt).all()
+    students = [row[0] for row in rows]
+    if rows:
+        total = rows[0].total
+    else:
+        # Пустая страница (например, offset за пределами) — окно ничего не вернуло
+        total = db.execute(select(func.count()).select_from(Students)).scalar_one()
+
+    next_cursor = next_cursor_id = None
+    # created_at допускает NULL, а по такой строке курсор не построить — клиент листает дальше через offset
+    if len(students) == limit and students[-1].created_at is not None:
+        next_cursor, next_cursor_id = students[-1].created_at, students[-1].id
+
+    # Один проход сериализации: собранные схемы сразу выгружаются в orjson, минуя response_model
+    student_schemas = _STUDENT_LIST_ADAPTER.validate_python(students, from_attributes=True)
+    return ORJSONResponse({
+        "students": _STUDENT_LIST_ADAPTER.dump_python(student_schemas),
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+        "next_cursor_id": next_cursor_id,
+    })
@@ -28,6 +28,8 @@ class StudentListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[datetime] = Field(None, description="Курсор следующей страницы (created_at)")
+    next_cursor_id: Optional[UUID] = Field(None, description="Курсор следующей страницы (id)")
 
 
 class BotUserSchema(BaseModel):
@@ -84,9 +86,21 @@ class RecommendationSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RecommendationWithEventSchema(BaseModel):
+    id: int
+    student_id: UUID
+    event_id: UUID
+    score: Optional[float] = None
+    created_at: Optional[datetime] = None
+    event: EventSchema
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class FeedbackCreateSchema(BaseModel):
     student_id: UUID
-    rating: int
+    # Диапазон совпадает с CHECK в таблице feedback и проверяется в pydantic-core без Python-валидатора
+    rating: int = Field(..., ge=1, le=5)
     comment: Optional[str] = None
 
 
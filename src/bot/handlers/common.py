@@ -2,39 +2,42 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from src.bot.middlewares.auth_middleware import allow_unauthorized, auth_required
 
+HELP_TEXT = (
+    "🆘 *Справка по боту*\n\n"
+    "Этот бот помогает студентам ТюмГУ находить подходящие мероприятия.\n\n"
+    "*Доступные команды:*\n"
+    "• /start - Авторизация в системе\n"
+    "• /help - Эта справка\n"
+    "• /menu - Главное меню\n"
+    "• /cancel - Отмена текущего действия\n\n"
+    "*После авторизации доступны:*\n"
+    "• 🎯 Мои рекомендации - персональные предложения\n"
+    "• 🔍 Поиск мероприятий - фильтры и поиск\n"
+    "• 📝 Обратная связь - ваши предложения"
+)
+CANCEL_TEXT = "Действие отменено."
+UNKNOWN_COMMAND_TEXT = (
+    "❓ Неизвестная команда.\n\n"
+    "Используйте /menu для просмотра доступных функций или /help для справки."
+)
+
 @allow_unauthorized
 async def help_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обрабатывает команду /help."""
-    help_text = (
-        "🆘 *Справка по боту*\n\n"
-        "Этот бот помогает студентам ТюмГУ находить подходящие мероприятия.\n\n"
-        "*Доступные команды:*\n"
-        "• /start - Авторизация в системе\n"
-        "• /help - Эта справка\n"
-        "• /menu - Главное меню\n"
-        "• /cancel - Отмена текущего действия\n\n"
-        "*После авторизации доступны:*\n"
-        "• 🎯 Мои рекомендации - персональные предложения\n"
-        "• 🔍 Поиск мероприятий - фильтры и поиск\n"
-        "• 📝 Обратная связь - ваши предложения"
-    )
     message = update.message or update.edited_message
     if message:
-        await message.reply_text(help_text, parse_mode='Markdown')
+        await message.reply_text(HELP_TEXT, parse_mode='Markdown')
 
 @auth_required
 async def cancel_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обрабатывает команду /cancel."""
     message = update.message or update.edited_message
     if message:
-        await message.reply_text("Действие отменено.")
+        await message.reply_text(CANCEL_TEXT)
 
 @allow_unauthorized
 async def unknown_command_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обрабатывает неизвестные команды."""
     message = update.message or update.edited_message
     if message:
-        await message.reply_text(
-            "❓ Неизвестная команда.\n\n"
-            "Используйте /menu для просмотра доступных функций или /help для справки."
-        )
\ No newline at end of file
+        await message.reply_text(UNKNOWN_COMMAND_TEXT)
\ No newline at end of file
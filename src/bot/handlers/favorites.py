@@ -1,30 +1,89 @@
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
-from uuid import UUID
+import asyncio
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Dict
 
 from src.bot.services.api_client import api_client, APIClientError
 from src.bot.middlewares.auth_middleware import auth_required
-from .recommendations import format_event_card
-
-
+from .recommendations import (
+    ADD_FAVORITE_PREFIX,
+    BUTTONS_CACHE_SIZE,
+    REMOVE_FAVORITE_PREFIX,
+    UUID_RE,
+    format_event_card,
+)
+
+
+_FAVORITE_ACTIONS = frozenset({"add", "remove"})
+
+FAVORITES_LIMIT = 100
+
+# Шаблоны сообщений с числами: общий текст задан один раз, подставляется только счётчик
+PERSONAL_CABINET_TEMPLATE = (
+    "⭐ *Личный кабинет*\n\n"
+    "📊 *Статистика:*\n"
+    "• Избранных мероприятий: {count}\n\n"
+    "Выберите раздел:"
+)
+FAVORITES_HEADER_TEMPLATE = "⭐ *Избранные мероприятия ({count})*\n\n"
+# Сколько секунд список избранного, загруженный в личном кабинете, используется без повторного запроса
+FAVORITES_PREFETCH_TTL = 30.0
+
+BACK_TO_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+BACK_TO_CABINET_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="personal_cabinet")]])
+# Навигация одинакова для всех карточек; на каждый вызов создаётся только кнопка избранного
+FAVORITE_NAV_ROW = (
+    InlineKeyboardButton("➡️ Следующее", callback_data="favorite_next"),
+    InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu"),
+)
+
+
+@lru_cache(maxsize=BUTTONS_CACHE_SIZE)
 def get_favorite_buttons(event_id: str, is_favorite: bool = False) -> InlineKeyboardMarkup:
     """Создает кнопки для избранного мероприятия."""
     keyboard = [
         [
             InlineKeyboardButton(
                 "❌ Удалить из избранного" if is_favorite else "⭐ Добавить в избранное",
-                callback_data=f"{'remove_favorite' if is_favorite else 'add_favorite'}_{event_id}"
+                callback_data=(REMOVE_FAVORITE_PREFIX if is_favorite else ADD_FAVORITE_PREFIX) + event_id
             )
         ],
-        [
-            InlineKeyboardButton("➡️ Следующее", callback_data="favorite_next"),
-            InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")
-        ]
+        FAVORITE_NAV_ROW,
     ]
     return InlineKeyboardMarkup(keyboard)
 
 
+@dataclass(slots=True)
+class FavoritesPrefetch:
+    """Список избранного, загруженный в личном кабинете заранее."""
+
+    student_id: str
+    items: list
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass(slots=True)
+class FavoritesBrowser:
+    """Состояние листания избранного: мероприятия по id, порядок показа и текущая позиция."""
+
+    events_by_id: dict[str, dict]
+    order: list[str]
+    index: int = 0
+
+
+def _take_prefetched_favorites(context: ContextTypes.DEFAULT_TYPE, student_id: str) -> list | None:
+    """Забирает список избранного, загруженный в личном кабинете, если он ещё свежий."""
+    prefetch: FavoritesPrefetch | None = context.user_data.pop('favorites_prefetch', None)
+    if prefetch is None or prefetch.student_id != student_id:
+        return None
+    if time.monotonic() - prefetch.fetched_at > FAVORITES_PREFETCH_TTL:
+        return None
+    return prefetch.items
+
+
 @auth_required
 async def show_personal_cabinet(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Показывает личный кабинет пользователя."""
@@ -42,18 +101,26 @@ async def show_personal_cabinet(update: Update, context: ContextTypes.DEFAULT_TY
         )
         return
 
-    try:
-        student_uuid = UUID(student_id)
-    except (ValueError, TypeError):
+    student_uuid = context.user_data.get('student_uuid')
+    if student_uuid is None:
         await update.callback_query.edit_message_text(
             "Ошибка идентификации студента. Попробуйте авторизоваться заново."
         )
         return
 
-    try:
-        favorites_count = await api_client.get_favorites_count(student_uuid)
-    except APIClientError:
+    # Счётчик и сам список запрашиваются параллельно: список почти всегда нужен следующим шагом
+    favorites_count, favorites = await asyncio.gather(
+        api_client.get_favorites_count(student_uuid),
+        api_client.get_favorites(student_uuid, limit=FAVORITES_LIMIT),
+        return_exceptions=True,
+    )
+    for result in (favorites_count, favorites):
+        if isinstance(result, BaseException) and not isinstance(result, APIClientError):
+            raise result
+    if isinstance(favorites_count, APIClientError):
         favorites_count = 0
+    if not isinstance(favorites, APIClientError):
+        context.user_data['favorites_prefetch'] = FavoritesPrefetch(student_id=student_id, items=favorites)
 
     keyboard = [
         [InlineKeyboardButton(f"⭐ Избранные ({favorites_count})", callback_data="my_favorites")],
@@ -61,12 +128,7 @@ async def show_personal_cabinet(update: Update, context: ContextTypes.DEFAULT_TY
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
 
-    text = (
-        "⭐ *Личный кабинет*\n\n"
-        f"📊 *Статистика:*\n"
-        f"• Избранных мероприятий: {favorites_count}\n\n"
-        "Выберите раздел:"
-    )
+    text = PERSONAL_CABINET_TEMPLATE.format(count=favorites_count)
 
     await update.callback_query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
 
@@ -88,20 +150,21 @@ async def show_favorites(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
 
-    try:
-        student_uuid = UUID(student_id)
-    except (ValueError, TypeError):
+    student_uuid = context.user_data.get('student_uuid')
+    if student_uuid is None:
         await update.callback_query.edit_message_text(
             "Ошибка идентификации студента. Попробуйте авторизоваться заново."
         )
         return
 
+    favorites = _take_prefetched_favorites(context, student_id)
     try:
-        favorites = await api_client.get_favorites(student_uuid, limit=100)
+        if favorites is None:
+            favorites = await api_client.get_favorites(student_uuid, limit=FAVORITES_LIMIT)
     except APIClientError:
         await update.callback_query.edit_message_text(
             "Не удалось загрузить избранные мероприятия. Попробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+            reply_markup=BACK_TO_MENU_MARKUP
         )
         return
 
@@ -109,29 +172,32 @@ async def show_favorites(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.callback_query.edit_message_text(
             "⭐ У вас пока нет избранных мероприятий.\n\n"
             "Добавьте мероприятия в избранное, чтобы они отображались здесь!",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="personal_cabinet")]])
+            reply_markup=BACK_TO_CABINET_MARKUP
         )
         return
 
-    # Сохраняем избранные в контекст
-    context.user_data['current_favorites'] = favorites
-    context.user_data['current_favorite_index'] = 0
-
-    # Получаем информацию о первом мероприятии
-    first_fav = favorites[0]
-    event = first_fav.get("event")
-    
-    if not event:
+    # Сохраняем избранные в контекст: словарь по id для поиска при нажатии кнопок и порядок для листания
+    favorites_by_id = {
+        str(fav["event"]["id"]): fav["event"]
+        for fav in favorites
+        if fav.get("event")
+    }
+    if not favorites_by_id:
         await update.callback_query.edit_message_text(
             "Ошибка загрузки мероприятия. Попробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="personal_cabinet")]])
+            reply_markup=BACK_TO_CABINET_MARKUP
         )
         return
 
-    event_id = str(event.get("id"))
+    browser = FavoritesBrowser(events_by_id=favorites_by_id, order=list(favorites_by_id))
+    context.user_data['favorites_browser'] = browser
+
+    # Получаем информацию о первом мероприятии
+    event_id = browser.order[0]
+    event = favorites_by_id[event_id]
     is_fav = True  # Уже в избранном
 
-    text = f"⭐ *Избранные мероприятия ({len(favorites)})*\n\n" + format_event_card(event)
+    text = FAVORITES_HEADER_TEMPLATE.format(count=len(browser.order)) + format_event_card(event)
     
     await update.callback_query.edit_message_text(
         text,
@@ -144,18 +210,18 @@ async def show_favorites(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 @auth_required
 async def handle_favorite_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обрабатывает добавление/удаление из избранного."""
+    # Callback подтверждается ровно один раз — итоговым уведомлением по каждой ветке ниже,
+    # повторный answer() для того же запроса Telegram уже не принимает
     query = update.callback_query
-    await query.answer()
 
     # Парсим callback_data: "add_favorite_{event_id}" или "remove_favorite_{event_id}"
-    parts = query.data.split('_', 2)
-    if len(parts) < 3:
+    action, _, rest = query.data.partition('_')  # "add" или "remove"
+    kind, _, event_id_str = rest.partition('_')  # "favorite" и UUID мероприятия
+    if action not in _FAVORITE_ACTIONS or kind != "favorite" or not UUID_RE.match(event_id_str):
         await query.answer("Ошибка обработки запроса", show_alert=True)
         return
-    
-    action = parts[0]  # "add" или "remove"
-    event_id_str = parts[2]  # UUID мероприятия
-    event_uuid = UUID(event_id_str)
+    # id остаётся строкой: API принимает его в пути как есть, а кэши ключуются строками
+    event_id_str = event_id_str.lower()
 
     student = context.user_data.get('student')
     if not student:
@@ -167,55 +233,63 @@ async def handle_favorite_action(update: Update, context: ContextTypes.DEFAULT_T
         await query.answer("Ошибка: не найден идентификатор студента", show_alert=True)
         return
 
-    try:
-        student_uuid = UUID(student_id)
-    except (ValueError, TypeError):
+    student_uuid = context.user_data.get('student_uuid')
+    if student_uuid is None:
         await query.answer("Ошибка идентификации студента", show_alert=True)
         return
 
     try:
         if action == 'add':
-            await api_client.add_favorite(student_uuid, event_uuid)
-            await query.answer("✅ Добавлено в избранное!")
+            await api_client.add_favorite(student_uuid, event_id_str)
+            answer_text = "✅ Добавлено в избранное!"
             is_favorite = True
-        elif action == 'remove':
-            await api_client.remove_favorite(student_uuid, event_uuid)
-            await query.answer("❌ Удалено из избранного")
-            is_favorite = False
         else:
-            return
+            await api_client.remove_favorite(student_uuid, event_id_str)
+            answer_text = "❌ Удалено из избранного"
+            is_favorite = False
     except APIClientError as e:
         if "409" in str(e) or "уже в избранном" in str(e).lower():
-            await query.answer("⚠️ Уже в избранном", show_alert=False)
+            answer_text = "⚠️ Уже в избранном"
             is_favorite = True
         elif "404" in str(e) or "не найдено" in str(e).lower():
-            await query.answer("⚠️ Не найдено в избранном", show_alert=False)
+            answer_text = "⚠️ Не найдено в избранном"
             is_favorite = False
         else:
             await query.answer("Ошибка при обработке запроса", show_alert=True)
             return
 
+    await query.answer(answer_text)
+
+    # Множества избранного из окон поиска и рекомендаций должны совпадать с сервером,
+    # иначе «Следующее» покажет старую кнопку
+    for ids_key in ('search_favorite_ids', 'recommendations_favorite_ids'):
+        favorite_ids = context.user_data.get(ids_key)
+        if favorite_ids is not None:
+            if is_favorite:
+                favorite_ids.add(event_id_str)
+            else:
+                favorite_ids.discard(event_id_str)
+
     # Обновляем текущее сообщение с новым статусом избранного
-    # Пытаемся найти событие в текущем контексте
-    event = None
     current_text = query.message.text if query.message else ""
-    
-    # Проверяем разные источники события
-    if 'current_favorites' in context.user_data:
-        favorites = context.user_data.get('current_favorites', [])
-        for fav in favorites:
-            if str(fav.get("event", {}).get("id")) == event_id_str:
-                event = fav.get("event")
-                break
-    elif 'search_events' in context.user_data:
-        event = context.user_data.get('search_events', {}).get(event_id_str)
-    elif 'recommendations_events' in context.user_data:
-        event = context.user_data.get('recommendations_events', {}).get(event_id_str)
-    
+
+    # Ищем событие во всех локальных кэшах: карточки избранного, поиска и рекомендаций
+    # уже загружены пачкой, и в user_data одновременно могут лежать несколько из них
+    browser: FavoritesBrowser | None = context.user_data.get('favorites_browser')
+    event_caches = (
+        browser.events_by_id if browser is not None else None,
+        context.user_data.get('search_events'),
+        context.user_data.get('recommendations_events'),
+    )
+    event = next(
+        (cache[event_id_str] for cache in event_caches if cache and event_id_str in cache),
+        None,
+    )
+
     # Если не нашли, пытаемся загрузить
     if not event:
         try:
-            event = await api_client.get_event(event_uuid)
+            event = await api_client.get_event(event_id_str)
         except APIClientError:
             pass
     
@@ -230,9 +304,9 @@ async def handle_favorite_action(update: Update, context: ContextTypes.DEFAULT_T
                 disable_web_page_preview=True
             )
         elif "Найдено мероприятий" in current_text:
+            from .search import SEARCH_HEADER_TEMPLATE, get_search_buttons
             results = context.user_data.get('search_results', [])
-            text = f"🔍 *Найдено мероприятий: {len(results)}*\n\n" + format_event_card(event)
-            from .search import get_search_buttons
+            text = SEARCH_HEADER_TEMPLATE.format(count=len(results)) + format_event_card(event)
             await query.edit_message_text(
                 text,
                 reply_markup=get_search_buttons(event_id_str, is_favorite),
@@ -256,26 +330,23 @@ async def show_next_favorite(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    favorites = context.user_data.get('current_favorites', [])
-    current_index = context.user_data.get('current_favorite_index', 0)
+    browser: FavoritesBrowser | None = context.user_data.get('favorites_browser')
 
-    if not favorites:
+    if browser is None or not browser.order:
         await show_favorites(update, context)
         return
 
     # Переходим к следующему
-    current_index = (current_index + 1) % len(favorites)
-    context.user_data['current_favorite_index'] = current_index
+    browser.index = (browser.index + 1) % len(browser.order)
 
-    favorite = favorites[current_index]
-    event = favorite.get("event")
+    event_id = browser.order[browser.index]
+    event = browser.events_by_id.get(event_id)
 
     if not event:
         await show_favorites(update, context)
         return
 
-    event_id = str(event.get("id"))
-    text = f"⭐ *Избранные мероприятия ({len(favorites)})*\n\n" + format_event_card(event)
+    text = FAVORITES_HEADER_TEMPLATE.format(count=len(browser.order)) + format_event_card(event)
 
     await query.edit_message_text(
         text,
@@ -8,23 +8,60 @@ from src.bot.services.api_client import api_client, APIClientError
 WAITING_FEEDBACK_RATING = 1
 WAITING_FEEDBACK_COMMENT = 2
 
+# callback_data кнопок оценки -> оценка; по этой же таблице разбирается нажатие
+RATING_BY_CALLBACK = {f"rating_{rating}": rating for rating in range(1, 6)}
+
+# Оценок всего пять, поэтому тексты с выбранной оценкой собираются заранее
+RATING_CONFIRM_TEXT = {
+    rating: (
+        f"📝 *Обратная связь*\n\n"
+        f"Вы выбрали оценку: {'⭐' * rating} ({rating}/5)\n\n"
+        "Хотите добавить комментарий?"
+    )
+    for rating in RATING_BY_CALLBACK.values()
+}
+FEEDBACK_THANKS_TEXT = {
+    rating: (
+        "✅ Спасибо за ваш отзыв!\n\n"
+        f"Ваша оценка: {'⭐' * rating} ({rating}/5)\n"
+        "Ваше мнение помогает нам становиться лучше! 💫"
+    )
+    for rating in RATING_BY_CALLBACK.values()
+}
+
+# Ключи user_data, которые живут только в пределах одного диалога обратной связи
+FEEDBACK_STATE_KEYS = ('feedback_rating',)
+
+
+def _reset_feedback_state(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Сбрасывает состояние диалога обратной связи."""
+    for key in FEEDBACK_STATE_KEYS:
+        context.user_data.pop(key, None)
+
+
+# Статичные клавиатуры собираются один раз при импорте
+RATING_MARKUP = InlineKeyboardMarkup([
+    *([InlineKeyboardButton(f"⭐ {rating}", callback_data=callback_data)]
+      for callback_data, rating in RATING_BY_CALLBACK.items()),
+    [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
+])
+COMMENT_CHOICE_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💬 Добавить комментарий", callback_data="add_comment")],
+    [InlineKeyboardButton("✅ Отправить без комментария", callback_data="send_without_comment")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
+])
+BACK_TO_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+TO_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 В меню", callback_data="back_to_menu")]])
+
 @auth_required
 async def request_feedback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Запрашивает обратную связь от пользователя."""
     if update.callback_query:
         await update.callback_query.answer()
 
-    context.user_data.pop('feedback_rating', None)
+    _reset_feedback_state(context)
 
-    keyboard = [
-        [InlineKeyboardButton("⭐ 1", callback_data="rating_1")],
-        [InlineKeyboardButton("⭐ 2", callback_data="rating_2")],
-        [InlineKeyboardButton("⭐ 3", callback_data="rating_3")],
-        [InlineKeyboardButton("⭐ 4", callback_data="rating_4")],
-        [InlineKeyboardButton("⭐ 5", callback_data="rating_5")],
-        [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = RATING_MARKUP
 
     text = (
         "📝 *Обратная связь*\n\n"
@@ -46,22 +83,13 @@ async def handle_rating_selection(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    rating = int(query.data.split('_')[1])
+    rating = RATING_BY_CALLBACK.get(query.data)
+    if rating is None:
+        return WAITING_FEEDBACK_RATING
     context.user_data['feedback_rating'] = rating
 
-    keyboard = [
-        [InlineKeyboardButton("💬 Добавить комментарий", callback_data="add_comment")],
-        [InlineKeyboardButton("✅ Отправить без комментария", callback_data="send_without_comment")],
-        [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    stars = "⭐" * rating
-    text = (
-        f"📝 *Обратная связь*\n\n"
-        f"Вы выбрали оценку: {stars} ({rating}/5)\n\n"
-        "Хотите добавить комментарий?"
-    )
+    reply_markup = COMMENT_CHOICE_MARKUP
+    text = RATING_CONFIRM_TEXT[rating]
 
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
 
@@ -73,8 +101,7 @@ async def add_comment(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     query = update.callback_query
     await query.answer()
 
-    keyboard = [[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = BACK_TO_MENU_MARKUP
 
     text = (
         "💬 *Добавьте комментарий*\n\n"
@@ -126,32 +153,25 @@ async def save_feedback(update: Update, context: ContextTypes.DEFAULT_TYPE, comm
         else:
             await update.callback_query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 В меню", callback_data="back_to_menu")]])
+                reply_markup=TO_MENU_MARKUP
             )
         return
 
-    stars = "⭐" * rating
-    text = (
-        "✅ Спасибо за ваш отзыв!\n\n"
-        f"Ваша оценка: {stars} ({rating}/5)\n"
-        "Ваше мнение помогает нам становиться лучше! 💫"
-    )
-
-    keyboard = [[InlineKeyboardButton("🔙 В меню", callback_data="back_to_menu")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    text = FEEDBACK_THANKS_TEXT[rating]
+    reply_markup = TO_MENU_MARKUP
 
     if update.message:
         await update.message.reply_text(text, reply_markup=reply_markup)
     else:
         await update.callback_query.edit_message_text(text, reply_markup=reply_markup)
 
-    context.user_data.pop('feedback_rating', None)
+    _reset_feedback_state(context)
 
 @auth_required
 async def cancel_feedback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Отменяет процесс обратной связи."""
     await update.callback_query.answer()
-    context.user_data.pop('feedback_rating', None)
+    _reset_feedback_state(context)
     from .main_menu import show_main_menu
     await show_main_menu(update, context)
     return ConversationHandler.END
\ No newline at end of file
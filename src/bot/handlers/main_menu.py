@@ -2,35 +2,39 @@ from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 from src.bot.middlewares.auth_middleware import auth_required
 
+# Клавиатура статична, поэтому собирается один раз (объекты PTB неизменяемы после создания)
+MAIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🎯 Мои рекомендации", callback_data="my_recommendations")],
+    [InlineKeyboardButton("📥 Выгрузить рекомендации", callback_data="export_recommendations")],
+    [InlineKeyboardButton("🔍 Поиск мероприятий", callback_data="event_search")],
+    [InlineKeyboardButton("⭐ Личный кабинет", callback_data="personal_cabinet")],
+    [InlineKeyboardButton("📝 Обратная связь", callback_data="feedback")]
+])
+
+MAIN_MENU_TEXT = (
+    "🏠 *Главное меню*\n\n"
+    "Выберите нужный раздел:\n"
+    "• 🎯 *Мои рекомендации* - персональные предложения мероприятий\n"
+    "• 📥 *Выгрузить рекомендации* - скачать все рекомендации в формате DOCX\n"
+    "• 🔍 *Поиск мероприятий* - поиск по различным критериям\n"
+    "• ⭐ *Личный кабинет* - избранные мероприятия и профиль\n"
+    "• 📝 *Обратная связь* - оценка работы бота (1-5 звезд)"
+)
+
 @auth_required
 async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Показывает главное меню с основными функциями."""
-    keyboard = [
-        [InlineKeyboardButton("🎯 Мои рекомендации", callback_data="my_recommendations")],
-        [InlineKeyboardButton("📥 Выгрузить рекомендации", callback_data="export_recommendations")],
-        [InlineKeyboardButton("🔍 Поиск мероприятий", callback_data="event_search")],
-        [InlineKeyboardButton("⭐ Личный кабинет", callback_data="personal_cabinet")],
-        [InlineKeyboardButton("📝 Обратная связь", callback_data="feedback")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    text = (
-        "🏠 *Главное меню*\n\n"
-        "Выберите нужный раздел:\n"
-        "• 🎯 *Мои рекомендации* - персональные предложения мероприятий\n"
-        "• 📥 *Выгрузить рекомендации* - скачать все рекомендации в формате DOCX\n"
-        "• 🔍 *Поиск мероприятий* - поиск по различным критериям\n"
-        "• ⭐ *Личный кабинет* - избранные мероприятия и профиль\n"
-        "• 📝 *Обратная связь* - оценка работы бота (1-5 звезд)"
-    )
-
-    if update.callback_query:
-        await update.callback_query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+    query = update.callback_query
+    if query:
+        send = query.edit_message_text
     else:
         # Обрабатываем как обычное сообщение, так и отредактированное
         message = update.message or update.edited_message
-        if message:
-            await message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+        if not message:
+            return
+        send = message.reply_text
+
+    await send(MAIN_MENU_TEXT, reply_markup=MAIN_MENU_MARKUP, parse_mode='Markdown')
 
 @auth_required
 async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1,94 +1,192 @@
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 from datetime import datetime, date
-from uuid import UUID
-from typing import Any, Mapping, Dict
+from typing import Any, Mapping, Dict, Iterable
+from functools import lru_cache
+import asyncio
+import copy
 import io
+import re
+import time
 
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.style import WD_STYLE_TYPE
 
 from src.bot.services.api_client import api_client, APIClientError
 from src.bot.middlewares.auth_middleware import auth_required
 
+# Клавиатуры карточек зависят только от (event_id, is_favorite) и кэшируются;
+# объекты PTB неизменяемы, поэтому одну разметку можно отдавать в разные сообщения
+BUTTONS_CACHE_SIZE = 2048
+CARD_CACHE_SIZE = 1024
+
+# Мероприятия, загруженные для одного пользователя, переиспользуются всеми на время TTL
+EVENT_CACHE_TTL = 300.0
+EVENT_CACHE_MAXSIZE = 10_000
+
+# event_id -> (время загрузки по time.monotonic, мероприятие)
+_event_cache: dict[str, tuple[float, Dict[str, Any]]] = {}
+
+
+def _get_cached_events(event_ids: list[str], now: float) -> tuple[Dict[str, Dict[str, Any]], list[str]]:
+    """Делит id на найденные в кэше мероприятия и те, что нужно загрузить."""
+    found: Dict[str, Dict[str, Any]] = {}
+    missing: list[str] = []
+    for event_id in event_ids:
+        entry = _event_cache.get(str(event_id))
+        if entry and now - entry[0] < EVENT_CACHE_TTL:
+            found[str(event_id)] = entry[1]
+        else:
+            missing.append(event_id)
+    return found, missing
+
+
+def _remember_events(events: Iterable[Dict[str, Any]], now: float) -> None:
+    for event in events:
+        key = str(event["id"])
+        _event_cache.pop(key, None)
+        if len(_event_cache) >= EVENT_CACHE_MAXSIZE:
+            # Словарь хранит порядок вставки — вытесняем самую старую запись
+            _event_cache.pop(next(iter(_event_cache)))
+        _event_cache[key] = (now, event)
+
+
+# Статичные клавиатуры ошибок и пустых выдач собираются один раз при импорте
+BACK_TO_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+SEARCH_EVENTS_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("🔍 Поиск мероприятий", callback_data="event_search")]])
+# Нижний ряд карточки рекомендации одинаков для всех мероприятий
+RECOMMENDATION_BOTTOM_ROW = (
+    InlineKeyboardButton("🔄 Показать другие", callback_data="show_other_events"),
+    InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu"),
+)
+
+# Проверка формата id из callback_data: API принимает id строкой, и разбирать её в UUID незачем
+UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+
+# Префиксы callback_data кнопки избранного общие для карточек рекомендаций, поиска и избранного
+ADD_FAVORITE_PREFIX = "add_favorite_"
+REMOVE_FAVORITE_PREFIX = "remove_favorite_"
+
+DATE_PARSE_CACHE_SIZE = 4096
+# Размер части списка мероприятий при повторной загрузке выгрузки после неудачного bulk-запроса
+EXPORT_EVENTS_CHUNK_SIZE = 100
+# Выгрузка читает рекомендации страницами по EXPORT_PAGE_SIZE, всего не больше EXPORT_RECOMMENDATIONS_LIMIT
+EXPORT_PAGE_SIZE = 100
+EXPORT_RECOMMENDATIONS_LIMIT = 1000
+
 def _parse_date(value: Any) -> date | None:
     if not value:
         return None
     if isinstance(value, date):
         return value
     if isinstance(value, str):
+        return _parse_date_str(value)
+    return None
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse_date_str(value: str) -> date | None:
+    # У мероприятий немного различных дат, а выгрузка DOCX разбирает их для каждой строки
+    # API отдаёт даты в ISO-формате, поэтому сначала пробуем разобрать YYYY-MM-DD срезами
+    if len(value) >= 10 and value[4] == '-' and value[7] == '-':
         try:
-            return datetime.fromisoformat(value).date()
+            return date(int(value[:4]), int(value[5:7]), int(value[8:10]))
         except ValueError:
-            try:
-                return datetime.strptime(value, "%Y-%m-%d").date()
-            except ValueError:
-                return None
-    return None
+            pass
+    # fromisoformat (Python 3.11) разбирает и даты со временем и смещением; strptime здесь не нужен
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
 
 
-def _get_value(event: Mapping[str, Any] | Any, attr: str) -> Any:
-    if isinstance(event, Mapping):
-        return event.get(attr)
-    return getattr(event, attr, None)
+def _format_date(value: date) -> str:
+    # То же, что strftime('%d.%m.%Y'), но без обращения к локали на каждую дату выгрузки
+    return f"{value.day:02d}.{value.month:02d}.{value.year:04d}"
+
+
+# Поля мероприятия в порядке аргументов _format_event_card
+CARD_FIELDS = (
+    "title",
+    "short_description",
+    "start_date",
+    "end_date",
+    "format",
+    "link",
+    "likes_count",
+    "dislikes_count",
+)
 
 
 def format_event_card(event: Mapping[str, Any] | Any) -> str:
     """Форматирует карточку мероприятия, поддерживая словари и ORM объекты."""
-    start_raw = _get_value(event, "start_date")
-    end_raw = _get_value(event, "end_date")
+    # Кэш ключуется самими выводимыми значениями, поэтому изменение лайков или описания
+    # сразу даёт новую карточку, а листание тех же мероприятий берёт готовый текст.
+    # Словарь это или ORM объект, проверяется один раз на все поля
+    if isinstance(event, Mapping):
+        return _format_event_card(*[event.get(field) for field in CARD_FIELDS])
+    return _format_event_card(*[getattr(event, field, None) for field in CARD_FIELDS])
+
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def _format_event_card(
+    title: Any,
+    short_description: Any,
+    start_raw: Any,
+    end_raw: Any,
+    format_value: Any,
+    link: Any,
+    likes_count: Any,
+    dislikes_count: Any,
+) -> str:
     start_date = _parse_date(start_raw)
     end_date = _parse_date(end_raw)
 
-    start_str = start_date.strftime('%d.%m.%Y') if start_date else 'Не указана'
-    end_str = end_date.strftime('%d.%m.%Y') if end_date else ''
+    start_str = _format_date(start_date) if start_date else 'Не указана'
+    end_str = _format_date(end_date) if end_date else ''
 
     date_str = start_str
     if end_str and start_str != end_str:
         date_str = f"{start_str} - {end_str}"
 
-    title = _get_value(event, "title") or "Без названия"
-    short_description = _get_value(event, "short_description")
-    format_value = _get_value(event, "format")
-    link = _get_value(event, "link")
-    likes_count = _get_value(event, "likes_count") or 0
-    dislikes_count = _get_value(event, "dislikes_count") or 0
+    title = title or "Без названия"
+    likes_count = likes_count or 0
+    dislikes_count = dislikes_count or 0
 
-    text = f"🎯 *{title}*\n\n"
+    parts = [f"🎯 *{title}*\n\n"]
 
     if short_description:
-        text += f"{short_description}\n\n"
+        parts.append(f"{short_description}\n\n")
 
-    text += f"📅 Дата: {date_str}\n"
+    parts.append(f"📅 Дата: {date_str}\n")
 
     if format_value:
-        text += f"🎯 Формат: {format_value}\n"
+        parts.append(f"🎯 Формат: {format_value}\n")
 
     if link:
-        text += f"🔗 [Регистрация]({link})\n"
+        parts.append(f"🔗 [Регистрация]({link})\n")
 
-    text += f"👍 {likes_count} 👎 {dislikes_count}"
+    parts.append(f"👍 {likes_count} 👎 {dislikes_count}")
 
-    return text
+    return "".join(parts)
 
+@lru_cache(maxsize=BUTTONS_CACHE_SIZE)
 def get_recommendation_buttons(event_id: str, is_favorite: bool = False) -> InlineKeyboardMarkup:
     """Создает кнопки для взаимодействия с рекомендацией."""
     keyboard = [
         [
-            InlineKeyboardButton("👍 Интересно", callback_data=f"like_{event_id}"),
-            InlineKeyboardButton("👎 Не интересно", callback_data=f"dislike_{event_id}")
+            InlineKeyboardButton("👍 Интересно", callback_data="like_" + event_id),
+            InlineKeyboardButton("👎 Не интересно", callback_data="dislike_" + event_id)
         ],
         [
             InlineKeyboardButton(
                 "❌ Удалить из избранного" if is_favorite else "⭐ В избранное",
-                callback_data=f"{'remove_favorite' if is_favorite else 'add_favorite'}_{event_id}"
+                callback_data=(REMOVE_FAVORITE_PREFIX if is_favorite else ADD_FAVORITE_PREFIX) + event_id
             )
         ],
-        [
-            InlineKeyboardButton("🔄 Показать другие", callback_data="show_other_events"),
-            InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")
-        ]
+        RECOMMENDATION_BOTTOM_ROW,
     ]
     return InlineKeyboardMarkup(keyboard)
 
@@ -109,20 +207,19 @@ async def show_recommendations(update: Update, context: ContextTypes.DEFAULT_TYP
         )
         return
 
-    try:
-        student_uuid = UUID(student_id)
-    except (ValueError, TypeError):
+    student_uuid = context.user_data.get('student_uuid')
+    if student_uuid is None:
         await update.callback_query.edit_message_text(
             "Ошибка идентификации студента. Попробуйте авторизоваться заново."
         )
         return
 
     try:
-        recommendations = await api_client.get_recommendations(student_uuid, limit=10)
+        recommendations = await api_client.get_recommendations_with_events(student_uuid, limit=10)
     except APIClientError:
         await update.callback_query.edit_message_text(
             "Не удалось загрузить рекомендации. Попробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+            reply_markup=BACK_TO_MENU_MARKUP
         )
         return
 
@@ -130,55 +227,46 @@ async def show_recommendations(update: Update, context: ContextTypes.DEFAULT_TYP
         await update.callback_query.edit_message_text(
             "Пока нет подходящих мероприятий для рекомендаций.\n"
             "Попробуйте воспользоваться поиском мероприятий!",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔍 Поиск мероприятий", callback_data="event_search")]])
+            reply_markup=SEARCH_EVENTS_MARKUP
         )
         return
 
+    # Мероприятия приходят вместе с рекомендациями одним JOIN-запросом; в user_data рекомендации
+    # хранятся без них, а сами мероприятия — в кэше по id, откуда их берут «Далее» и лайки
+    events_cache: Dict[str, Dict[str, Any]] = {}
+    for rec in recommendations:
+        event = rec.pop("event", None)
+        if event:
+            events_cache[str(event["id"])] = event
+    _remember_events(events_cache.values(), time.monotonic())
+
     context.user_data['current_recommendations'] = recommendations
     context.user_data['current_recommendation_index'] = 0
-
-    event_ids = [rec.get("event_id") for rec in recommendations if rec.get("event_id")]
-    events_cache: Dict[str, Any] = {}
-    if event_ids:
-        try:
-            bulk_response = await api_client.get_events_bulk(event_ids)
-            for event in bulk_response.get("events", []):
-                events_cache[str(event["id"])] = event
-        except APIClientError:
-            events_cache = {}
-
     context.user_data['recommendations_events'] = events_cache
 
-    first_rec = recommendations[0]
-    event_id = first_rec.get("event_id")
-    event = events_cache.get(str(event_id))
-
-    if not event:
-        if event_id:
-            try:
-                event = await api_client.get_event(UUID(event_id))
-            except APIClientError:
-                event = None
-            if event:
-                events_cache[str(event["id"])] = event
+    event_key = str(recommendations[0].get("event_id"))
 
+    event = events_cache.get(event_key)
     if not event:
         await update.callback_query.edit_message_text(
             "Ошибка загрузки мероприятия. Попробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+            reply_markup=BACK_TO_MENU_MARKUP
         )
         return
 
-    # Проверяем, находится ли мероприятие в избранном
-    is_favorite = False
+    # Избранное проверяется одним запросом на всё окно рекомендаций; дальше «Далее» и лайки
+    # берут статус из этого множества, а handle_favorite_action обновляет его на месте
+    favorite_ids: set[str] = set()
     try:
-        is_favorite = await api_client.check_favorite(student_uuid, UUID(str(event_id)))
+        favorite_ids = await api_client.list_favorite_event_ids(student_uuid, list(events_cache))
     except APIClientError:
         pass  # Игнорируем ошибку проверки избранного
+    context.user_data['recommendations_favorite_ids'] = favorite_ids
+    is_favorite = event_key in favorite_ids
 
     await update.callback_query.edit_message_text(
         format_event_card(event),
-        reply_markup=get_recommendation_buttons(str(event["id"]), is_favorite),
+        reply_markup=get_recommendation_buttons(event_key, is_favorite),
         parse_mode='Markdown',
         disable_web_page_preview=True
     )
@@ -189,19 +277,25 @@ async def handle_recommendation_feedback(update: Update, context: ContextTypes.D
     query = update.callback_query
     await query.answer()
 
-    action, event_id_str = query.data.split('_')
-    event_uuid = UUID(event_id_str)
+    action, _, event_id_str = query.data.partition('_')
+    if action not in ('like', 'dislike'):
+        return
+    if not UUID_RE.match(event_id_str):
+        return
+    event_key = event_id_str.lower()
 
     try:
         if action == 'like':
-            updated_event = await api_client.like_event(event_uuid)
+            updated_event = await api_client.like_event(event_key)
             event_cache = context.user_data.get('recommendations_events', {})
             if isinstance(event_cache, dict) and updated_event:
-                event_cache[str(updated_event["id"])] = updated_event
+                event_cache[event_key] = updated_event
                 context.user_data['recommendations_events'] = event_cache
+                _remember_events((updated_event,), time.monotonic())
             await query.answer("Спасибо! Учтем ваши предпочтения 👍")
         elif action == 'dislike':
-            await api_client.dislike_event(event_uuid)
+            await api_client.dislike_event(event_key)
+            _event_cache.pop(event_key, None)  # Счётчики изменились
             await show_next_recommendation(update, context)
             return
     except APIClientError:
@@ -211,31 +305,23 @@ async def handle_recommendation_feedback(update: Update, context: ContextTypes.D
     event_cache = context.user_data.get('recommendations_events', {})
     event = {}
     if isinstance(event_cache, dict):
-        event = event_cache.get(str(event_uuid), {})
+        event = event_cache.get(event_key, {})
 
     if not event:
         try:
-            event = await api_client.get_event(event_uuid)
+            event = await api_client.get_event(event_key)
         except APIClientError:
             event = None
         if event and isinstance(event_cache, dict):
-            event_cache[str(event["id"])] = event
+            event_cache[event_key] = event
             context.user_data['recommendations_events'] = event_cache
 
     if event:
-        # Проверяем избранное
-        student = context.user_data.get('student')
-        is_favorite = False
-        if student:
-            try:
-                student_uuid = UUID(student.get("id"))
-                is_favorite = await api_client.check_favorite(student_uuid, event_uuid)
-            except (ValueError, TypeError, APIClientError):
-                pass
-        
+        is_favorite = event_key in context.user_data.get('recommendations_favorite_ids', ())
+
         await query.edit_message_text(
             format_event_card(event),
-            reply_markup=get_recommendation_buttons(str(event["id"]), is_favorite),
+            reply_markup=get_recommendation_buttons(event_key, is_favorite),
             parse_mode='Markdown',
             disable_web_page_preview=True
         )
@@ -262,43 +348,72 @@ async def show_next_recommendation(update: Update, context: ContextTypes.DEFAULT
         await show_recommendations(update, context)
         return
 
+    event_key = str(event_id)
     events_cache = context.user_data.get('recommendations_events', {})
     event = {}
     if isinstance(events_cache, dict):
-        event = events_cache.get(str(event_id), {})
+        event = events_cache.get(event_key, {})
 
     if not event:
         try:
-            event = await api_client.get_event(UUID(event_id))
+            event = await api_client.get_event(event_key)
         except APIClientError:
             event = None
         if not event:
             await show_recommendations(update, context)
             return
         if isinstance(events_cache, dict):
-            events_cache[str(event["id"])] = event
+            events_cache[event_key] = event
             context.user_data['recommendations_events'] = events_cache
 
-    # Проверяем избранное
-    student = context.user_data.get('student')
-    is_favorite = False
-    if student and event:
-        try:
-            student_uuid = UUID(student.get("id"))
-            is_favorite = await api_client.check_favorite(student_uuid, UUID(event_id))
-        except (ValueError, TypeError, APIClientError):
-            pass
+    is_favorite = event_key in context.user_data.get('recommendations_favorite_ids', ())
 
     await query.edit_message_text(
         format_event_card(event),
-        reply_markup=get_recommendation_buttons(str(event["id"]), is_favorite),
+        reply_markup=get_recommendation_buttons(event_key, is_favorite),
         parse_mode='Markdown',
         disable_web_page_preview=True
     )
 
+    # Пока пользователь читает карточку, загружаем следующее мероприятие в фоне
+    next_event_id = recommendations[(current_index + 1) % len(recommendations)].get("event_id")
+    if next_event_id and isinstance(events_cache, dict) and str(next_event_id) not in events_cache:
+        context.user_data['recommendations_events'] = events_cache
+        context.application.create_task(_prefetch_event(str(next_event_id), events_cache), update=update)
 
-def create_recommendations_docx(recommendations: list[Dict[str, Any]], events: Dict[str, Dict[str, Any]]) -> io.BytesIO:
-    """Создает DOCX файл с рекомендациями, отсортированными по score (от самых близких)."""
+
+async def _prefetch_event(event_id: str, events_cache: Dict[str, Dict[str, Any]]) -> None:
+    """Кладет мероприятие в кэш пользователя, чтобы следующая карточка открылась без запроса."""
+    now = time.monotonic()
+    found, missing_ids = _get_cached_events([event_id], now)
+    if not missing_ids:
+        events_cache.update(found)
+        return
+    try:
+        event = await api_client.get_event(event_id)
+    except APIClientError:
+        return
+    if event:
+        events_cache[event_id] = event
+        _remember_events((event,), now)
+
+
+def _add_event_styles(doc: Any) -> tuple[Any, Any]:
+    """Создает стили заголовка и описания мероприятия для выгрузки."""
+    # Оформление задаётся стилем один раз, а не правкой шрифта каждого run
+    title_style = doc.styles.add_style('EventTitle', WD_STYLE_TYPE.PARAGRAPH)
+    title_style.base_style = doc.styles['Heading 1']
+    title_style.font.size = Pt(14)
+    title_style.font.bold = True
+
+    description_style = doc.styles.add_style('EventDescription', WD_STYLE_TYPE.PARAGRAPH)
+    description_style.base_style = doc.styles['Normal']
+    description_style.font.size = Pt(11)
+    return title_style, description_style
+
+
+def create_recommendations_docx(recommendations: list[Dict[str, Any]], events: Dict[str, Dict[str, Any]]) -> bytes:
+    """Создает DOCX файл с рекомендациями в порядке API (по убыванию score)."""
     doc = Document()
     
     # Заголовок документа
@@ -314,22 +429,17 @@ def create_recommendations_docx(recommendations: list[Dict[str, Any]], events: D
     
     doc.add_paragraph()  # Пустая строка
     
-    # Сортируем рекомендации по score (от большего к меньшему)
-    sorted_recommendations = sorted(
-        recommendations,
-        key=lambda x: x.get("score", 0.0),
-        reverse=True
-    )
-    
-    if not sorted_recommendations:
+    # API уже отдаёт рекомендации по убыванию score, повторная сортировка не нужна
+    if not recommendations:
         doc.add_paragraph("Пока нет рекомендаций.")
-        doc_buffer = io.BytesIO()
-        doc.save(doc_buffer)
-        doc_buffer.seek(0)
-        return doc_buffer
+        return _save_docx(doc)
+    
+    title_style, description_style = _add_event_styles(doc)
+    # Разделитель одинаков для всех мероприятий: первый строим через python-docx, остальные копируем
+    separator_elements: list[Any] = []
     
     # Добавляем каждую рекомендацию
-    for idx, rec in enumerate(sorted_recommendations, 1):
+    for idx, rec in enumerate(recommendations, 1):
         event_id = str(rec.get("event_id", ""))
         event = events.get(event_id)
         
@@ -337,16 +447,11 @@ def create_recommendations_docx(recommendations: list[Dict[str, Any]], events: D
             continue
         
         # Заголовок мероприятия
-        event_title = doc.add_heading(f'{idx}. {event.get("title", "Без названия")}', level=1)
-        event_title_format = event_title.runs[0].font
-        event_title_format.size = Pt(14)
-        event_title_format.bold = True
+        doc.add_paragraph(f'{idx}. {event.get("title", "Без названия")}', style=title_style)
         
         # Описание
         if event.get("short_description"):
-            desc_para = doc.add_paragraph(event["short_description"])
-            desc_format = desc_para.runs[0].font
-            desc_format.size = Pt(11)
+            doc.add_paragraph(event["short_description"], style=description_style)
         
         # Информация о мероприятии
         info_para = doc.add_paragraph()
@@ -358,8 +463,8 @@ def create_recommendations_docx(recommendations: list[Dict[str, Any]], events: D
         end_date = _parse_date(end_raw)
         
         if start_date:
-            start_str = start_date.strftime('%d.%m.%Y')
-            end_str = end_date.strftime('%d.%m.%Y') if end_date else ''
+            start_str = _format_date(start_date)
+            end_str = _format_date(end_date) if end_date else ''
             date_str = start_str
             if end_str and start_str != end_str:
                 date_str = f"{start_str} - {end_str}"
@@ -392,15 +497,87 @@ def create_recommendations_docx(recommendations: list[Dict[str, Any]], events: D
         info_para.add_run(f"👍 {likes}  👎 {dislikes}")
         
         # Разделитель между мероприятиями
-        if idx < len(sorted_recommendations):
-            doc.add_paragraph("─" * 50)
-            doc.add_paragraph()
+        if idx < len(recommendations):
+            if separator_elements:
+                for element in separator_elements:
+                    # _insert_p вставляет абзац перед sectPr, как и add_paragraph
+                    doc.element.body._insert_p(copy.deepcopy(element))
+            else:
+                separator_elements = [doc.add_paragraph("─" * 50)._p, doc.add_paragraph()._p]
     
-    # Сохраняем документ в BytesIO
+    return _save_docx(doc)
+
+
+def _save_docx(doc: Any) -> bytes:
+    # Отдаём готовые байты, а не буфер: PTB всё равно читает файл целиком перед отправкой,
+    # и с буфером в памяти одновременно жили бы две копии документа
     doc_buffer = io.BytesIO()
     doc.save(doc_buffer)
-    doc_buffer.seek(0)
-    return doc_buffer
+    return doc_buffer.getvalue()
+
+
+def _raise_unexpected(results: list[Any]) -> None:
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, APIClientError):
+            raise result
+
+
+async def _fetch_events_for_export(event_ids: list[str]) -> Dict[str, Dict[str, Any]]:
+    """Загружает мероприятия для выгрузки: одним bulk-запросом, а при ошибке — частями.
+
+    Если не удалась и часть, её мероприятия запрашиваются поштучно, но параллельно.
+    """
+    events: Dict[str, Dict[str, Any]] = {}
+    try:
+        bulk_response = await api_client.get_events_bulk(event_ids)
+    except APIClientError:
+        pass
+    else:
+        # Ответ get_events_bulk — EventListResponse, уже декодированный orjson,
+        # поэтому ключ "events" в нём есть всегда
+        for event in bulk_response["events"]:
+            events[str(event["id"])] = event
+        return events
+
+    chunks = [
+        event_ids[start:start + EXPORT_EVENTS_CHUNK_SIZE]
+        for start in range(0, len(event_ids), EXPORT_EVENTS_CHUNK_SIZE)
+    ]
+    chunk_results = await asyncio.gather(
+        *(api_client.get_events_bulk(chunk) for chunk in chunks),
+        return_exceptions=True,
+    )
+    _raise_unexpected(chunk_results)
+
+    failed_ids: list[str] = []
+    for chunk, result in zip(chunks, chunk_results):
+        if isinstance(result, APIClientError):
+            failed_ids.extend(chunk)
+            continue
+        for event in result["events"]:
+            events[str(event["id"])] = event
+
+    if failed_ids:
+        single_results = await asyncio.gather(
+            *(api_client.get_event(event_id) for event_id in failed_ids),
+            return_exceptions=True,
+        )
+        _raise_unexpected(single_results)
+        for event in single_results:
+            if event and not isinstance(event, APIClientError):
+                events[str(event["id"])] = event
+
+    return events
+
+
+async def _load_export_events(event_ids: list[str]) -> Dict[str, Dict[str, Any]]:
+    now = time.monotonic()
+    events, missing_ids = _get_cached_events(event_ids, now)
+    if missing_ids:
+        fetched = await _fetch_events_for_export(missing_ids)
+        _remember_events(fetched.values(), now)
+        events.update(fetched)
+    return events
 
 
 @auth_required
@@ -416,7 +593,7 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+                reply_markup=BACK_TO_MENU_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
@@ -428,20 +605,19 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+                reply_markup=BACK_TO_MENU_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
         return
     
-    try:
-        student_uuid = UUID(student_id)
-    except (ValueError, TypeError):
+    student_uuid = context.user_data.get('student_uuid')
+    if student_uuid is None:
         error_text = "Ошибка идентификации студента. Попробуйте авторизоваться заново."
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+                reply_markup=BACK_TO_MENU_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
@@ -454,15 +630,35 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
     else:
         loading_msg = await update.message.reply_text(loading_text)
     
+    # Рекомендации идут страницами; мероприятия каждой страницы начинают грузиться сразу,
+    # пока запрашивается следующая
+    recommendations: list[Dict[str, Any]] = []
+    event_tasks: list[asyncio.Task] = []
+    seen_event_ids: set[str] = set()
     try:
-        # Получаем все рекомендации (большой лимит)
-        recommendations = await api_client.get_recommendations(student_uuid, limit=1000)
+        async for page in api_client.iter_recommendations(
+            student_uuid,
+            page_size=EXPORT_PAGE_SIZE,
+            max_items=EXPORT_RECOMMENDATIONS_LIMIT,
+        ):
+            recommendations.extend(page)
+            # Одно мероприятие может встречаться в рекомендациях несколько раз — запрашиваем его один раз
+            page_event_ids = [
+                event_id
+                for event_id in dict.fromkeys(rec["event_id"] for rec in page if rec.get("event_id"))
+                if event_id not in seen_event_ids
+            ]
+            seen_event_ids.update(page_event_ids)
+            if page_event_ids:
+                event_tasks.append(asyncio.create_task(_load_export_events(page_event_ids)))
     except APIClientError:
+        for task in event_tasks:
+            task.cancel()
         error_text = "Не удалось загрузить рекомендации. Попробуйте позже."
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+                reply_markup=BACK_TO_MENU_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
@@ -476,40 +672,27 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔍 Поиск мероприятий", callback_data="event_search")]])
+                reply_markup=SEARCH_EVENTS_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
         return
     
-    # Получаем информацию о событиях
-    event_ids = [rec.get("event_id") for rec in recommendations if rec.get("event_id")]
+    # Собираем мероприятия, загруженные по страницам
     events: Dict[str, Dict[str, Any]] = {}
+    for page_events in await asyncio.gather(*event_tasks):
+        events.update(page_events)
     
-    if event_ids:
-        try:
-            bulk_response = await api_client.get_events_bulk(event_ids)
-            for event in bulk_response.get("events", []):
-                events[str(event["id"])] = event
-        except APIClientError:
-            # Если bulk не сработал, получаем по одному
-            for event_id in event_ids:
-                try:
-                    event = await api_client.get_event(UUID(event_id))
-                    if event:
-                        events[str(event["id"])] = event
-                except APIClientError:
-                    continue
-    
-    # Создаем DOCX файл
+    # Создаем DOCX файл в пуле потоков: сборка документа синхронная и на тысяче
+    # мероприятий надолго заняла бы цикл событий, задерживая ответы остальным пользователям
     try:
-        docx_buffer = create_recommendations_docx(recommendations, events)
+        docx_bytes = await asyncio.to_thread(create_recommendations_docx, recommendations, events)
     except Exception as e:
         error_text = f"Ошибка при создании файла: {str(e)}"
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+                reply_markup=BACK_TO_MENU_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
@@ -522,7 +705,7 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
         if query:
             # Отправляем файл
             await query.message.reply_document(
-                document=docx_buffer,
+                document=docx_bytes,
                 filename=filename,
                 caption=f"📄 Ваши рекомендации ({len(recommendations)} мероприятий)"
             )
@@ -536,7 +719,7 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
                 )
         else:
             await update.message.reply_document(
-                document=docx_buffer,
+                document=docx_bytes,
                 filename=filename,
                 caption=f"📄 Ваши рекомендации ({len(recommendations)} мероприятий)"
             )
@@ -545,7 +728,7 @@ async def export_recommendations(update: Update, context: ContextTypes.DEFAULT_T
         if query:
             await query.edit_message_text(
                 error_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
+                reply_markup=BACK_TO_MENU_MARKUP
             )
         else:
             await update.message.reply_text(error_text)
@@ -1,66 +1,100 @@
-from datetime import datetime
-from typing import Any, Mapping
-from uuid import UUID
+from functools import lru_cache
+from typing import Any, Dict, Mapping
+import asyncio
+import time
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 
-from .recommendations import format_event_card
+from .recommendations import (
+    ADD_FAVORITE_PREFIX,
+    BUTTONS_CACHE_SIZE,
+    CARD_FIELDS,
+    REMOVE_FAVORITE_PREFIX,
+    format_event_card,
+)
 from src.bot.services.api_client import api_client, APIClientError
 from src.bot.middlewares.auth_middleware import auth_required
 
+SEARCH_HEADER_TEMPLATE = "🔍 *Найдено мероприятий: {count}*\n\n"
+# Клавиатуры, не зависящие от мероприятия, собираются один раз при импорте
+SEARCH_FILTERS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📅 Ближайшие мероприятия", callback_data="filter_recent")],
+    [InlineKeyboardButton("🎯 По моему направлению", callback_data="filter_direction")],
+    [InlineKeyboardButton("🔍 Все активные", callback_data="filter_all")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
+])
+SEARCH_FILTERS_TEXT = (
+    "🔍 *Поиск мероприятий*\n\n"
+    "Выберите критерий поиска:\n"
+    "• 📅 *Ближайшие* - мероприятия в ближайшее время\n"
+    "• 🎯 *По направлению* - мероприятия для вашего направления\n"
+    "• 🔍 *Все активные* - полный список мероприятий"
+)
+BACK_TO_SEARCH_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🔙 Назад к поиску", callback_data="event_search")]]
+)
+# Нижние ряды карточки поиска одинаковы для всех мероприятий
+SEARCH_CARD_ROWS = (
+    (InlineKeyboardButton("➡️ Следующее", callback_data="search_next"),),
+    (InlineKeyboardButton("🔍 Новый поиск", callback_data="event_search"),),
+    (InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu"),),
+)
+# Через столько секунд окно результатов поиска перечитывается, чтобы лайки в карточках не устаревали
+SEARCH_CACHE_TTL = 300.0
+
+
+def _compact_event(event: Mapping[str, Any]) -> Dict[str, Any]:
+    """Оставляет у мероприятия только поля карточки — результаты поиска живут в user_data."""
+    compact = {field: event.get(field) for field in CARD_FIELDS}
+    compact["id"] = event["id"]
+    return compact
+
+
+async def _refresh_search_window(user_data: Dict[str, Any], results: list[str]) -> None:
+    """Перечитывает мероприятия окна поиска и избранное среди них; при ошибке оставляет прежние данные."""
+    student_uuid = user_data.get('student_uuid')
+    requests = [api_client.get_events_bulk(results)]
+    if student_uuid is not None:
+        requests.append(api_client.list_favorite_event_ids(student_uuid, results))
+    responses = await asyncio.gather(*requests, return_exceptions=True)
+    for response in responses:
+        if isinstance(response, BaseException) and not isinstance(response, APIClientError):
+            raise response
+
+    events_response = responses[0]
+    if not isinstance(events_response, APIClientError):
+        search_cache = user_data.get('search_events', {})
+        search_cache.update(
+            (str(event["id"]), _compact_event(event)) for event in events_response["events"]
+        )
+        user_data['search_events'] = search_cache
+        user_data['search_loaded_at'] = time.monotonic()
+    if len(responses) > 1 and not isinstance(responses[1], APIClientError):
+        user_data['search_favorite_ids'] = responses[1]
 
-def _parse_datetime(value: Any) -> datetime | None:
-    if not value:
-        return None
-    if isinstance(value, datetime):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value)
-        except ValueError:
-            try:
-                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
-            except ValueError:
-                return None
-    return None
 
+@lru_cache(maxsize=BUTTONS_CACHE_SIZE)
 def get_search_buttons(event_id: str, is_favorite: bool = False) -> InlineKeyboardMarkup:
     """Создает кнопки для результатов поиска."""
     keyboard = [
         [
             InlineKeyboardButton(
                 "❌ Удалить из избранного" if is_favorite else "⭐ В избранное",
-                callback_data=f"{'remove_favorite' if is_favorite else 'add_favorite'}_{event_id}"
+                callback_data=(REMOVE_FAVORITE_PREFIX if is_favorite else ADD_FAVORITE_PREFIX) + event_id
             )
         ],
-        [InlineKeyboardButton("➡️ Следующее", callback_data="search_next")],
-        [InlineKeyboardButton("🔍 Новый поиск", callback_data="event_search")],
-        [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
+        *SEARCH_CARD_ROWS,
     ]
     return InlineKeyboardMarkup(keyboard)
 
 @auth_required
 async def show_search_filters(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Показывает упрощенные фильтры для поиска мероприятий."""
-    keyboard = [
-        [InlineKeyboardButton("📅 Ближайшие мероприятия", callback_data="filter_recent")],
-        [InlineKeyboardButton("🎯 По моему направлению", callback_data="filter_direction")],
-        [InlineKeyboardButton("🔍 Все активные", callback_data="filter_all")],
-        [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    text = (
-        "🔍 *Поиск мероприятий*\n\n"
-        "Выберите критерий поиска:\n"
-        "• 📅 *Ближайшие* - мероприятия в ближайшее время\n"
-        "• 🎯 *По направлению* - мероприятия для вашего направления\n"
-        "• 🔍 *Все активные* - полный список мероприятий"
+    await update.callback_query.edit_message_text(
+        SEARCH_FILTERS_TEXT, reply_markup=SEARCH_FILTERS_MARKUP, parse_mode='Markdown'
     )
 
-    await update.callback_query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-
 @auth_required
 async def handle_search_filter(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обрабатывает выбор фильтра поиска."""
@@ -75,17 +109,11 @@ async def handle_search_filter(update: Update, context: ContextTypes.DEFAULT_TYP
             response = await api_client.get_active_events(limit=50)
             events = response.get("events", [])
         elif filter_type == 'recent':
-            response = await api_client.get_active_events(limit=50)
-            events_raw = response.get("events", [])
-
-            def get_sort_date(event: Mapping[str, Any]) -> datetime:
-                start = _parse_datetime(event.get("start_date"))
-                created = _parse_datetime(event.get("created_at"))
-                return start or created or datetime.min
-
-            events = sorted(events_raw, key=get_sort_date)[:20]
+            # Сортировка по дате и отбор ближайших выполняются в базе
+            response = await api_client.get_upcoming_events(limit=20)
+            events = response.get("events", [])
         elif filter_type == 'direction' and student:
-            cluster_id = student.get("direction", {}).get("cluster_id") if isinstance(student, Mapping) else None
+            cluster_id = context.user_data.get('student_cluster_id')
             if cluster_id:
                 response = await api_client.get_events_by_clusters([cluster_id], limit=50)
                 events = response.get("events", [])
@@ -98,39 +126,40 @@ async def handle_search_filter(update: Update, context: ContextTypes.DEFAULT_TYP
     except APIClientError:
         await query.edit_message_text(
             "Не удалось загрузить мероприятия. Попробуйте позже.",
-            reply_markup=InlineKeyboardMarkup(
-                [[InlineKeyboardButton("🔙 Назад к поиску", callback_data="event_search")]]
-            )
+            reply_markup=BACK_TO_SEARCH_MARKUP
         )
         return
 
     if not events:
         await query.edit_message_text(
             "По вашему запросу мероприятий не найдено 😔",
-            reply_markup=InlineKeyboardMarkup(
-                [[InlineKeyboardButton("🔙 Назад к поиску", callback_data="event_search")]]
-            )
+            reply_markup=BACK_TO_SEARCH_MARKUP
         )
         return
 
     context.user_data['search_results'] = [str(event["id"]) for event in events]
-    context.user_data['search_events'] = {str(event["id"]): event for event in events}
+    context.user_data['search_events'] = {str(event["id"]): _compact_event(event) for event in events}
+    context.user_data['search_loaded_at'] = time.monotonic()
     context.user_data['current_search_index'] = 0
 
     event = events[0]
     event_id = str(event["id"])
     
-    # Проверяем избранное
-    is_favorite = False
-    if student:
+    # Избранное проверяется один раз для всего окна результатов, листание берёт ответ из множества
+    student_uuid = context.user_data.get('student_uuid')
+    favorite_ids: set[str] = set()
+    if student_uuid is not None:
         try:
-            student_uuid = UUID(student.get("id"))
-            is_favorite = await api_client.check_favorite(student_uuid, UUID(event_id))
-        except (ValueError, TypeError, APIClientError):
+            favorite_ids = await api_client.list_favorite_event_ids(
+                student_uuid, context.user_data['search_results']
+            )
+        except APIClientError:
             pass
+    context.user_data['search_favorite_ids'] = favorite_ids
+    is_favorite = event_id in favorite_ids
     
     await query.edit_message_text(
-        f"🔍 *Найдено мероприятий: {len(events)}*\n\n" + format_event_card(event),
+        SEARCH_HEADER_TEMPLATE.format(count=len(events)) + format_event_card(event),
         reply_markup=get_search_buttons(event_id, is_favorite),
         parse_mode='Markdown',
         disable_web_page_preview=True
@@ -158,41 +187,26 @@ async def show_next_search_result(update: Update, context: ContextTypes.DEFAULT_
     context.user_data['current_search_index'] = current_index
 
     event_id = results[current_index]
-    search_cache = context.user_data.get('search_events', {})
-    event = search_cache.get(event_id)
-
-    if not event:
-        try:
-            event_uuid = UUID(event_id)
-        except (ValueError, TypeError):
-            event_uuid = None
-
-        if event_uuid:
-            try:
-                event = await api_client.get_event(event_uuid)
-            except APIClientError:
-                event = None
-        else:
-            event = None
+    if event_id not in context.user_data.get('search_events', {}):
+        await _refresh_search_window(context.user_data, results)
 
+    event = context.user_data.get('search_events', {}).get(event_id)
     if not event:
         await show_search_filters(update, context)
         return
 
-    search_cache[event_id] = event
-    context.user_data['search_events'] = search_cache
+    # Устаревшее окно показываем сразу и перечитываем в фоне, пока пользователь читает карточку,
+    # так что следующее нажатие уже получит свежие лайки и избранное
+    now = time.monotonic()
+    if now - context.user_data.get('search_loaded_at', 0.0) > SEARCH_CACHE_TTL:
+        context.user_data['search_loaded_at'] = now  # Не запускаем обновление повторно на каждое нажатие
+        context.application.create_task(
+            _refresh_search_window(context.user_data, results), update=update
+        )
 
-    # Проверяем избранное
-    student = context.user_data.get('student')
-    is_favorite = False
-    if student:
-        try:
-            student_uuid = UUID(student.get("id"))
-            is_favorite = await api_client.check_favorite(student_uuid, UUID(event_id))
-        except (ValueError, TypeError, APIClientError):
-            pass
+    is_favorite = event_id in context.user_data.get('search_favorite_ids', ())
 
-    new_text = f"🔍 *Найдено мероприятий: {len(results)}*\n\n" + format_event_card(event)
+    new_text = SEARCH_HEADER_TEMPLATE.format(count=len(results)) + format_event_card(event)
     new_markup = get_search_buttons(str(event["id"]), is_favorite)
 
     current_text = query.message.text if query.message else None
@@ -2,7 +2,7 @@ from datetime import datetime
 from telegram import Update
 from telegram.ext import ContextTypes
 from src.bot.services.validation import is_valid_participant_id
-from src.bot.middlewares.auth_middleware import allow_unauthorized
+from src.bot.middlewares.auth_middleware import allow_unauthorized, store_student
 from .main_menu import show_main_menu
 from src.bot.services.api_client import api_client, APIClientError
 
@@ -20,7 +20,7 @@ async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         if bot_user and bot_user.get("is_linked"):
             context.user_data['_bot_user_cache'] = {'data': bot_user, 'timestamp': datetime.utcnow()}
             context.user_data['bot_user'] = bot_user
-            context.user_data['student'] = bot_user.get("student")
+            store_student(context, bot_user.get("student"))
             await show_main_menu(update, context)
             return
     except APIClientError:
@@ -69,7 +69,7 @@ async def handle_participant_id_input(update: Update, context: ContextTypes.DEFA
         if bot_user and bot_user.get("is_linked"):
             context.user_data['_bot_user_cache'] = {'data': bot_user, 'timestamp': datetime.utcnow()}
             context.user_data['bot_user'] = bot_user
-            context.user_data['student'] = bot_user.get("student")
+            store_student(context, bot_user.get("student"))
             await show_main_menu(update, context)
         else:
             await update.message.reply_text(
@@ -134,7 +134,7 @@ async def handle_participant_id_input(update: Update, context: ContextTypes.DEFA
                 "Теперь вы можете пользоваться всеми функциями бота!"
             )
             await update.message.reply_text(success_text)
-            context.user_data['student'] = student
+            store_student(context, student)
             new_bot_user = {"telegram_id": user_id, "student": student, "is_linked": True}
             context.user_data['bot_user'] = new_bot_user
             context.user_data['_bot_user_cache'] = {'data': new_bot_user, 'timestamp': datetime.utcnow()}
@@ -1,6 +1,5 @@
 import logging
 from typing import Optional
-import traceback
 
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackQueryHandler, ConversationHandler
@@ -57,15 +56,17 @@ async def _log_error(update: object, context) -> None:  # type: ignore[no-untype
                 "user_id": update.callback_query.from_user.id if update.callback_query.from_user else None,
             }
     
+    # Обработчик вызывается вне блока except, поэтому трейсбек берём из самого исключения
     logger.error(
-        f"Ошибка при обработке обновления: {error_type}: {str(error)}",
+        "Ошибка при обработке обновления: %s: %s",
+        error_type,
+        error,
         extra={
             "error_type": error_type,
             "error_message": str(error),
             "update_info": update_info,
-            "traceback": traceback.format_exc(),
         },
-        exc_info=True
+        exc_info=error
     )
     
     # Пытаемся уведомить пользователя об ошибке
@@ -4,6 +4,7 @@ from telegram import Update
 from telegram.ext import ContextTypes, CallbackContext
 from functools import wraps
 from typing import Any, Optional
+from uuid import UUID
 import logging
 from src.bot.services.api_client import api_client, APIClientError
 
@@ -22,10 +23,22 @@ def _get_cached_bot_user(context: ContextTypes.DEFAULT_TYPE, now: datetime) -> O
     return None
 
 
+def store_student(context: ContextTypes.DEFAULT_TYPE, student: Optional[dict]) -> None:
+    """Сохраняет студента в контексте вместе с его UUID и кластером направления, разобранными один раз при авторизации."""
+    context.user_data['student'] = student
+    try:
+        context.user_data['student_uuid'] = UUID(str(student["id"]))
+    except (KeyError, TypeError, ValueError):
+        context.user_data['student_uuid'] = None
+    # Направление приходит вместе со студентом; у студента без направления оно равно None
+    direction = student.get("direction") if isinstance(student, dict) else None
+    context.user_data['student_cluster_id'] = direction.get("cluster_id") if direction else None
+
+
 def _store_bot_user_cache(context: ContextTypes.DEFAULT_TYPE, bot_user: dict, now: datetime) -> None:
     context.user_data['_bot_user_cache'] = {'data': bot_user, 'timestamp': now}
     context.user_data['bot_user'] = bot_user
-    context.user_data['student'] = bot_user.get("student")
+    store_student(context, bot_user.get("student"))
 
 
 def _should_ping_activity(context: ContextTypes.DEFAULT_TYPE, now: datetime) -> bool:
@@ -75,6 +88,8 @@ def auth_required(func):
         if bot_user:
             context.user_data['bot_user'] = bot_user
             context.user_data['student'] = bot_user.get("student")
+            if 'student_uuid' not in context.user_data:
+                store_student(context, bot_user.get("student"))
 
         if _should_ping_activity(context, now):
             try:
@@ -148,6 +163,8 @@ class AuthMiddleware:
         if bot_user:
             context.user_data['bot_user'] = bot_user
             context.user_data['student'] = bot_user.get("student")
+            if 'student_uuid' not in context.user_data:
+                store_student(context, bot_user.get("student"))
 
         if _should_ping_activity(context, now):
             try:
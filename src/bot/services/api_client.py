@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 import httpx
+import orjson
 
 from src.core.config import settings
 
@@ -35,7 +36,8 @@ class APIClient:
             raise APIClientError(f"API request error: {exc}") from exc
 
         if response.content:
-            return response.json()
+            # orjson разбирает байты ответа напрямую, без декодирования в str, как делает response.json()
+            return orjson.loads(response.content)
         return None
 
     async def get_bot_user(self, telegram_id: int) -> Optional[Dict[str, Any]]:
@@ -68,6 +70,9 @@ class APIClient:
     async def get_active_events(self, limit: int = 50) -> Dict[str, Any]:
         return await self._request("GET", f"/events/active?limit={limit}")
 
+    async def get_upcoming_events(self, limit: int = 20) -> Dict[str, Any]:
+        return await self._request("GET", f"/events/upcoming?limit={limit}")
+
     async def get_events_by_clusters(self, cluster_ids: List[UUID | str], limit: int = 50) -> Dict[str, Any]:
         if not cluster_ids:
             return {"events": [], "total": 0}
@@ -80,21 +85,52 @@ class APIClient:
         payload = {"ids": [str(eid) for eid in event_ids]}
         return await self._request("POST", "/events/bulk", json=payload)
 
-    async def get_event(self, event_id: UUID) -> Optional[Dict[str, Any]]:
+    async def get_event(self, event_id: UUID | str) -> Optional[Dict[str, Any]]:
         return await self._request("GET", f"/events/{event_id}")
 
-    async def like_event(self, event_id: UUID) -> Dict[str, Any]:
+    async def like_event(self, event_id: UUID | str) -> Dict[str, Any]:
         return await self._request("POST", f"/events/{event_id}/like")
 
-    async def dislike_event(self, event_id: UUID) -> Dict[str, Any]:
+    async def dislike_event(self, event_id: UUID | str) -> Dict[str, Any]:
         return await self._request("POST", f"/events/{event_id}/dislike")
 
-    async def get_recommendations(self, student_id: UUID, limit: int = 10) -> List[Dict[str, Any]]:
-        result = await self._request("GET", f"/recommendations/by-student/{student_id}?limit={limit}")
+    async def get_recommendations(self, student_id: UUID, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        path = f"/recommendations/by-student/{student_id}?limit={limit}"
+        if offset:
+            path += f"&offset={offset}"
+        result = await self._request("GET", path)
+        if result is None:
+            return []
+        return result
+
+    async def get_recommendations_with_events(
+        self, student_id: UUID, limit: int = 10, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        path = f"/recommendations/by-student/{student_id}/with-events?limit={limit}"
+        if offset:
+            path += f"&offset={offset}"
+        result = await self._request("GET", path)
         if result is None:
             return []
         return result
 
+    async def iter_recommendations(
+        self,
+        student_id: UUID,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Отдаёт рекомендации студента страницами по page_size, не больше max_items всего."""
+        offset = 0
+        while max_items is None or offset < max_items:
+            limit = page_size if max_items is None else min(page_size, max_items - offset)
+            page = await self.get_recommendations(student_id, limit=limit, offset=offset)
+            if page:
+                yield page
+            if len(page) < limit:
+                return
+            offset += len(page)
+
     async def recalculate_recommendations(self, min_score: float = 0.0) -> Dict[str, Any]:
         return await self._request("POST", "/recommendations/recalculate", json={"min_score": min_score})
 
@@ -109,10 +145,10 @@ class APIClient:
         payload = {"student_id": str(student_id), "rating": rating, "comment": comment}
         return await self._request("POST", "/feedback", json=payload)
 
-    async def add_favorite(self, student_id: UUID, event_id: UUID) -> Dict[str, Any]:
+    async def add_favorite(self, student_id: UUID, event_id: UUID | str) -> Dict[str, Any]:
         return await self._request("POST", f"/favorites/{student_id}/{event_id}")
 
-    async def remove_favorite(self, student_id: UUID, event_id: UUID) -> None:
+    async def remove_favorite(self, student_id: UUID, event_id: UUID | str) -> None:
         await self._request("DELETE", f"/favorites/{student_id}/{event_id}")
 
     async def get_favorites(self, student_id: UUID, limit: int = 100) -> List[Dict[str, Any]]:
@@ -121,10 +157,17 @@ class APIClient:
             return []
         return result
 
-    async def check_favorite(self, student_id: UUID, event_id: UUID) -> bool:
+    async def check_favorite(self, student_id: UUID, event_id: UUID | str) -> bool:
         result = await self._request("GET", f"/favorites/{student_id}/{event_id}/check")
         return result.get("is_favorite", False) if result else False
 
+    async def list_favorite_event_ids(self, student_id: UUID, event_ids: List[UUID | str]) -> set[str]:
+        if not event_ids:
+            return set()
+        payload = {"ids": [str(eid) for eid in event_ids]}
+        result = await self._request("POST", f"/favorites/by-student/{student_id}/check", json=payload)
+        return set(result.get("event_ids", [])) if result else set()
+
     async def get_favorites_count(self, student_id: UUID) -> int:
         result = await self._request("GET", f"/favorites/by-student/{student_id}/count")
         return result.get("count", 0) if result else 0
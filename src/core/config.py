@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     internal_api_url: str = "http://localhost:8000"
     admin_cors_origins: List[str] = ["http://localhost:5173"]
     log_level: str = "INFO"
+    # Список включаемых роутеров API (None — все), например ["bot_users", "events"]
+    enabled_routers: Optional[List[str]] = None
     
     # Sentry настройки
     sentry_dsn: Optional[str] = None
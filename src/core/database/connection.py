@@ -13,9 +13,33 @@ DBNAME = os.getenv("DBNAME")
 
 DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
 
-engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+# Размер пула соединений; API подстраивает под него пул потоков для sync-эндпоинтов
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+# Сколько ждать свободного соединения и через сколько секунд пересоздавать его,
+# чтобы не получать соединения, закрытые на стороне сервера/балансировщика
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=POOL_RECYCLE,
+    # executemany-вставки (загрузка мероприятий пачками) уходят многострочным VALUES, а не по одной строке
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 def get_db() -> Session:
-    """Создает и возвращает новую сессию базы данных."""
+    """
+    Создает и возвращает новую сессию базы данных.
+
+    Сессию стоит открывать как контекстный менеджер (`with get_db() as db:`),
+    тогда соединение вернется в пул даже при исключении.
+    """
     return SessionLocal()
@@ -1,21 +1,30 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, text
+from sqlalchemy import select, insert, update, delete, text
 from src.core.database.models import BotUsers, Students
 from uuid import UUID
 from typing import Optional
 
 def create_bot_user(db: Session, telegram_id: int, student_id: UUID, username: str = None, email: str = None):
-    """Создание нового пользователя бота."""
-    bot_user = BotUsers(
-        telegram_id=telegram_id,
-        student_id=student_id,
-        username=username,
-        email=email,
-        is_linked=True
+    """
+    Создание нового пользователя бота.
+
+    Значения по умолчанию (last_activity и т.п.) возвращаются через INSERT ... RETURNING,
+    а объект отсоединяется от сессии до commit, чтобы не перечитывать его отдельным SELECT.
+    """
+    stmt = (
+        insert(BotUsers)
+        .values(
+            telegram_id=telegram_id,
+            student_id=student_id,
+            username=username,
+            email=email,
+            is_linked=True,
+        )
+        .returning(BotUsers)
     )
-    db.add(bot_user)
+    bot_user = db.execute(stmt).scalar_one()
+    db.expunge(bot_user)
     db.commit()
-    db.refresh(bot_user)
     return bot_user
 
 def get_bot_user_by_telegram_id(db: Session, telegram_id: int):
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete
+from sqlalchemy import func, select, update, delete
 from src.core.database.models import Events, EventClusters
 from uuid import UUID
 from datetime import date
@@ -31,6 +31,10 @@ def create_event(db: Session, title: str, description: str = None, short_descrip
 
     return event
 
+def _event_columns():
+    """Столбцы мероприятия для выборок и RETURNING (без тяжёлого эмбеддинга)."""
+    return [column for column in Events.__table__.columns if column.key != "vector_embedding"]
+
 def get_event_by_id(db: Session, event_id: UUID):
     return db.get(Events, event_id)
 
@@ -39,8 +43,26 @@ def get_all_events(db: Session, limit: int = 100):
     return db.execute(stmt).scalars().all()
 
 def get_active_events(db: Session, limit: int = 100):
-    stmt = select(Events).where(Events.is_active == True).limit(limit)
-    return db.execute(stmt).scalars().all()
+    """Активные мероприятия — строки со столбцами из _event_columns, без ORM-объектов."""
+    stmt = select(*_event_columns()).where(Events.is_active == True).limit(limit)
+    return db.execute(stmt).all()
+
+def get_upcoming_events(db: Session, limit: int = 20):
+    """Ближайшие активные мероприятия: по дате начала, а без неё — по дате создания."""
+    # Выражение совпадает с индексом idx_events_active_sort_date, поэтому сортировка идёт по индексу
+    sort_date = func.coalesce(Events.start_date, func.date(Events.created_at))
+    stmt = (
+        select(*_event_columns())
+        .where(Events.is_active == True, sort_date >= func.current_date())
+        .order_by(sort_date)
+        .limit(limit)
+    )
+    return db.execute(stmt).all()
+
+def get_events_by_ids(db: Session, event_ids: list[UUID]):
+    """Мероприятия по списку id (порядок строк не гарантируется)."""
+    stmt = select(*_event_columns()).where(Events.id.in_(event_ids))
+    return db.execute(stmt).all()
 
 def update_event_info(db: Session, event_id: UUID, **kwargs):
     stmt = (
@@ -56,36 +78,40 @@ def delete_event(db: Session, event_id: UUID):
     db.commit()
 
 # Добавим функции для работы с лайками/дизлайками
+
 def increment_likes(db: Session, event_id: UUID):
-    """Увеличить счетчик лайков."""
+    """Увеличить счетчик лайков и вернуть обновлённую строку мероприятия (или None)."""
     stmt = (
         update(Events)
         .where(Events.id == event_id)
         .values(likes_count=Events.likes_count + 1)
+        .returning(*_event_columns())
     )
-    db.execute(stmt)
+    row = db.execute(stmt).one_or_none()
     db.commit()
+    return row
 
 def increment_dislikes(db: Session, event_id: UUID):
-    """Увеличить счетчик дизлайков."""
+    """Увеличить счетчик дизлайков и вернуть обновлённую строку мероприятия (или None)."""
     stmt = (
         update(Events)
         .where(Events.id == event_id)
         .values(dislikes_count=Events.dislikes_count + 1)
+        .returning(*_event_columns())
     )
-    db.execute(stmt)
+    row = db.execute(stmt).one_or_none()
     db.commit()
+    return row
 
 def get_events_by_clusters(db: Session, cluster_ids: list[UUID], limit: int = 50):
-    """Получить мероприятия по кластерам."""
-    from sqlalchemy import or_
+    """Получить мероприятия по кластерам (строки со столбцами из _event_columns)."""
     stmt = (
-        select(Events)
+        select(*_event_columns())
         .join(EventClusters, Events.id == EventClusters.event_id)
         .where(
             Events.is_active == True,
-            or_(*[EventClusters.cluster_id == cid for cid in cluster_ids])
+            EventClusters.cluster_id.in_(cluster_ids),
         )
         .limit(limit)
     )
-    return db.execute(stmt).scalars().all()
+    return db.execute(stmt).all()
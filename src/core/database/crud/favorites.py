@@ -1,6 +1,6 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import select, delete
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, delete, func
 from src.core.database.models import Favorites
 
 
@@ -37,9 +37,10 @@ def remove_favorite(db: Session, student_id: UUID, event_id: UUID) -> bool:
 
 
 def get_favorites_for_student(db: Session, student_id: UUID, limit: int = 100) -> list[Favorites]:
-    """Получить все избранные мероприятия студента."""
+    """Получить все избранные мероприятия студента вместе с мероприятиями (один запрос с JOIN)."""
     stmt = (
         select(Favorites)
+        .options(joinedload(Favorites.event, innerjoin=True))
         .where(Favorites.student_id == student_id)
         .order_by(Favorites.created_at.desc())
         .limit(limit)
@@ -58,15 +59,24 @@ def is_favorite(db: Session, student_id: UUID, event_id: UUID) -> bool:
     return favorite is not None
 
 
+def get_favorite_event_ids(db: Session, student_id: UUID, event_ids: list[UUID]) -> list[UUID]:
+    """Из переданных мероприятий вернуть те, что находятся в избранном студента (один запрос)."""
+    if not event_ids:
+        return []
+    stmt = select(Favorites.event_id).where(
+        Favorites.student_id == student_id,
+        Favorites.event_id.in_(event_ids),
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
 def get_favorite_by_id(db: Session, favorite_id: int) -> Favorites | None:
     """Получить избранное по ID."""
     return db.get(Favorites, favorite_id)
 
 
 def count_favorites_for_student(db: Session, student_id: UUID) -> int:
-    """Подсчитать количество избранных мероприятий студента."""
-    from sqlalchemy import func
-    stmt = select(func.count(Favorites.id)).where(Favorites.student_id == student_id)
-    result = db.execute(stmt).scalar()
-    return result or 0
+    """Подсчитать количество избранных мероприятий студента (COUNT(*) без загрузки строк)."""
+    stmt = select(func.count()).select_from(Favorites).where(Favorites.student_id == student_id)
+    return db.execute(stmt).scalar_one()
 
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select, update, delete
 from src.core.database.models import Recommendations
 from uuid import UUID
@@ -27,12 +27,27 @@ def get_recommendation_by_id(db: Session, rec_id: int):
     return db.get(Recommendations, rec_id)
 
 
-def get_recommendations_for_student(db: Session, student_id: UUID, limit: int = 10):
-    """Получить все рекомендации для конкретного студента."""
+def get_recommendations_for_student(db: Session, student_id: UUID, limit: int = 10, offset: int = 0):
+    """Получить рекомендации для конкретного студента (постранично, по убыванию score)."""
     stmt = (
         select(Recommendations)
         .where(Recommendations.student_id == student_id)
-        .order_by(Recommendations.score.desc())
+        # id делает порядок однозначным при равных score, чтобы страницы не пересекались
+        .order_by(Recommendations.score.desc(), Recommendations.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def get_recommendations_with_events_for_student(db: Session, student_id: UUID, limit: int = 10, offset: int = 0):
+    """Получить страницу рекомендаций студента вместе с мероприятиями (один запрос с JOIN)."""
+    stmt = (
+        select(Recommendations)
+        .options(joinedload(Recommendations.event, innerjoin=True))
+        .where(Recommendations.student_id == student_id)
+        .order_by(Recommendations.score.desc(), Recommendations.id)
+        .offset(offset)
         .limit(limit)
     )
     return db.execute(stmt).scalars().all()
@@ -3,6 +3,7 @@ import csv
 import os
 from typing import List, Dict
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -16,6 +17,17 @@ BASE_URL = "https://www.utmn.ru"
 START_URL = f"{BASE_URL}/news/events/"
 COMMON_CSV_FILE = "events.csv"
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# Одна сессия на модуль: keep-alive переиспользует TCP/TLS-соединения между страницами
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": USER_AGENT})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 
 def setup_driver(headless=True):
     options = Options()
@@ -125,12 +137,8 @@ def _normalize_src(src: str) -> str:
 
 
 def parse_event_page(url: str, timeout: int = 12) -> Dict[str, str]:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-    }
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _SESSION.get(url, timeout=timeout)
     except requests.RequestException as e:
         print(f"[requests] Ошибка запроса {url}: {e}")
         return {"title": "", "link": url, "description": "", "start_date": "", "end_date": "", "image": "", "online": "false"}
@@ -1,49 +1,91 @@
 # -*- coding: utf-8 -*-
-import torch
-import pandas as pd
+import csv
+from functools import lru_cache
+from itertools import islice
+
 import numpy as np
-from unsloth import FastLanguageModel
-from sentence_transformers import SentenceTransformer
 from src.recommendation.events.utils import format_event_for_db
 
-# === Проверка и инициализация GPU ===
-if not torch.cuda.is_available():
-    raise RuntimeError("❌ GPU не обнаружена. Проверь, что установлены CUDA и драйверы NVIDIA.")
-
-device = torch.device("cuda")
-print(f"✅ Используется устройство: {torch.cuda.get_device_name(0)}")
-
-# === Инициализация моделей ===
-model_name = "unsloth/Qwen3-4B-Instruct-2507"
-print("Загрузка модели Qwen3-4B-Instruct с поддержкой GPU...")
-model, tokenizer = FastLanguageModel.from_pretrained(
-    model_name=model_name,
-    max_seq_length=2048,
-    load_in_4bit=False,   # True - экономия VRAM, False - полный размер
-    load_in_8bit=False,
-)
-model.to(device)
-print("✅ Модель успешно загружена на GPU")
-
-embedder = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
-embedder.to(device)
-print("✅ Sentence-BERT загружен на GPU")
+MODEL_NAME = "unsloth/Qwen3-4B-Instruct-2507"
+EMBEDDER_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# Сколько мероприятий за один запуск прогоняется через LLM
+PROCESS_EVENTS_LIMIT = 5
+
+
+@lru_cache(maxsize=1)
+def _load_models():
+    """
+    Проверяет GPU и загружает LLM и Sentence-BERT при первом реальном использовании.
+
+    Результат кэшируется на процесс, поэтому импорт модуля (и, например, чтение CSV)
+    больше не платит за импорт torch/unsloth и загрузку весов.
+
+    Returns:
+        Кортеж (device, model, tokenizer, embedder)
+    """
+    import torch
+    from unsloth import FastLanguageModel
+    from sentence_transformers import SentenceTransformer
+
+    # === Проверка и инициализация GPU ===
+    if not torch.cuda.is_available():
+        raise RuntimeError("❌ GPU не обнаружена. Проверь, что установлены CUDA и драйверы NVIDIA.")
+
+    device = torch.device("cuda")
+    print(f"✅ Используется устройство: {torch.cuda.get_device_name(0)}")
+
+    # === Инициализация моделей ===
+    print("Загрузка модели Qwen3-4B-Instruct с поддержкой GPU...")
+    model, tokenizer = FastLanguageModel.from_pretrained(
+        model_name=MODEL_NAME,
+        max_seq_length=2048,
+        load_in_4bit=False,   # True - экономия VRAM, False - полный размер
+        load_in_8bit=False,
+    )
+    model.to(device)
+    print("✅ Модель успешно загружена на GPU")
+
+    embedder = SentenceTransformer(EMBEDDER_NAME)
+    embedder.to(device)
+    print("✅ Sentence-BERT загружен на GPU")
+
+    return device, model, tokenizer, embedder
 
 # === Основные функции ===
 
-def load_events_csv(filepath: str):
+_CSV_BOOLEANS = {"true": True, "false": False}
+
+
+def _csv_value(value):
+    """Приводит значение ячейки CSV так же, как pandas: пустое -> None, true/false -> bool."""
+    if value is None or value == "":
+        return None
+    return _CSV_BOOLEANS.get(value.lower(), value)
+
+
+def iter_events_csv(filepath: str):
+    """
+    Построчно читает события из CSV, не загружая файл целиком.
+    """
+    with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {key: _csv_value(value) for key, value in row.items()}
+
+
+def load_events_csv(filepath: str, limit: int | None = None):
     """
     Загружает события из CSV, превращая их в список словарей.
+    Если задан limit, читаются только первые limit строк.
     """
-    df = pd.read_csv(filepath)
-    df = df.where(pd.notnull(df), None)
-    return df.to_dict(orient="records")
+    return list(islice(iter_events_csv(filepath), limit))
 
 
 def generate_short_description(event_info: str) -> str:
     """
     Генерирует краткое описание мероприятия для Telegram-канала на основе event_info.
     """
+    device, model, tokenizer, _ = _load_models()
     system_prompt = """
 Ты — ассистент, который преобразует информацию о мероприятиях университета в структурированное описание для Telegram-канала.
 Формат вывода:
@@ -76,6 +118,7 @@ def extract_event_dates(event_text: str) -> str:
     start_date = DD.MM.YYYY HH:MM
     end_date = DD.MM.YYYY HH:MM
     """
+    device, model, tokenizer, _ = _load_models()
     system_prompt = """
 Ты — ассистент, который извлекает даты проведения мероприятия из текста.
 Формат:
@@ -99,6 +142,7 @@ def detect_event_online(event_text: str) -> str:
     online = False
     online = None
     """
+    device, model, tokenizer, _ = _load_models()
     system_prompt = """
 Ты — ассистент, который определяет формат мероприятия: онлайн или офлайн.
 Формат:
@@ -158,11 +202,12 @@ def vectorize_short_description(short_description: str):
     """
     if not short_description or not short_description.strip():
         return None
+    _, _, _, embedder = _load_models()
     embedding = embedder.encode([short_description])[0]
     return np.array(embedding, dtype=float)
 
 
-def process_events(events, limit=5):
+def process_events(events, limit=PROCESS_EVENTS_LIMIT):
     """
     Полностью обрабатывает события: генерирует короткое описание, определяет формат,
     извлекает даты, создает эмбеддинги и формирует полный объект события по структуре БД.
@@ -181,6 +226,9 @@ def process_events(events, limit=5):
     total = len(events) if limit is None else min(len(events), limit)
     
     print(f"🚀 Начало обработки {total} мероприятий...")
+    if total:
+        # Загружаем модели до цикла: отсутствие GPU должно прерывать обработку, а не каждое событие
+        _load_models()
     
     for i, event in enumerate(events[:total]):
         try:
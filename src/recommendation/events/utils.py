@@ -9,6 +9,7 @@ from typing import Any, Optional, Sequence
 
 import faiss
 import numpy as np
+import orjson
 
 
 def parse_date_string(date_str: str | datetime | Any) -> Optional[datetime]:
@@ -357,7 +358,8 @@ def process_events_from_csv(
     from src.recommendation.events import llm_generator
 
     print(f"📥 Загрузка мероприятий из: {input_path}")
-    raw_events = llm_generator.load_events_csv(str(input_path))
+    # Через LLM проходят только первые PROCESS_EVENTS_LIMIT строк — остальные не читаем
+    raw_events = llm_generator.load_events_csv(str(input_path), limit=llm_generator.PROCESS_EVENTS_LIMIT)
 
     print(f"⚙️  Обработка {len(raw_events)} мероприятий через LLM...")
     processed_events = llm_generator.process_events(raw_events)
@@ -378,11 +380,10 @@ def load_events_from_json_file(output_path: Path | str) -> list[dict[str, Any]]:
         return []
 
     try:
-        with output_path.open("r", encoding="utf-8") as f:
-            events = json.load(f)
+        events = orjson.loads(output_path.read_bytes())
         print(f"✅ Загружено {len(events)} мероприятий из {output_path}")
         return events
-    except (json.JSONDecodeError, Exception) as exc:
+    except (orjson.JSONDecodeError, Exception) as exc:
         print(f"❌ Ошибка загрузки файла {output_path}: {exc}")
         return []
 
@@ -510,93 +511,193 @@ def _assign_event_clusters(
         )
 
 
+EVENTS_INSERT_BATCH_SIZE = 1000
+EVENT_INSERT_MODES = ("bulk", "row")
+
+
+def _build_event_row(event: dict[str, Any]) -> dict[str, Any]:
+    """Готовит значения колонок events из словаря мероприятия."""
+
+    return {
+        "title": event.get("title", ""),
+        "short_description": event.get("short_description"),
+        "description": event.get("description"),
+        "format": event.get("format"),
+        "start_date": event.get("start_date"),
+        "end_date": event.get("end_date"),
+        "link": event.get("link"),
+        "image_url": event.get("image_url"),
+        # pgvector автоматически конвертирует список в Vector при сохранении
+        "vector_embedding": event.get("vector_embedding"),
+    }
+
+
+def _is_pending_duplicate(pending: dict[str, list[tuple[Any, Any]]], event: dict[str, Any]) -> bool:
+    """Повторяет логику check_event_exists для мероприятий текущей, ещё не записанной пачки."""
+
+    title = safe_strip(event.get("title")) or ""
+    if not title:
+        return False
+
+    start_date = event.get("start_date")
+    link = safe_strip(event.get("link")) or None
+    for pending_date, pending_link in pending.get(title, ()):
+        if start_date is not None and pending_date != start_date:
+            continue
+        if link is not None and pending_link != link:
+            continue
+        return True
+    return False
+
+
+def _remember_pending(pending: dict[str, list[tuple[Any, Any]]], event: dict[str, Any]) -> None:
+    title = safe_strip(event.get("title")) or ""
+    if title:
+        link = safe_strip(event.get("link")) or None
+        pending.setdefault(title, []).append((event.get("start_date"), link))
+
+
+def _insert_event_row(
+    db,
+    event: dict[str, Any],
+    cluster_args: Optional[tuple] = None,
+) -> None:
+    """Добавляет одно мероприятие отдельной транзакцией."""
+
+    from src.core.database.models import Events
+
+    new_event = Events(**_build_event_row(event))
+    db.add(new_event)
+    db.flush()
+
+    if cluster_args is not None:
+        _assign_event_clusters(
+            db,
+            new_event.id,
+            event.get("title", "Без названия"),
+            event.get("vector_embedding"),
+            *cluster_args,
+        )
+
+    db.commit()
+
+
+def _insert_events_batch(
+    db,
+    batch: list[dict[str, Any]],
+    cluster_args: Optional[tuple] = None,
+) -> None:
+    """Добавляет пачку мероприятий одним executemany-INSERT в одной транзакции."""
+
+    from sqlalchemy import insert
+    from src.core.database.models import Events
+
+    stmt = insert(Events).returning(Events.id, sort_by_parameter_order=True)
+    event_ids = db.execute(stmt, [_build_event_row(event) for event in batch]).scalars().all()
+
+    if cluster_args is not None:
+        for event_id, event in zip(event_ids, batch):
+            _assign_event_clusters(
+                db,
+                event_id,
+                event.get("title", "Без названия"),
+                event.get("vector_embedding"),
+                *cluster_args,
+            )
+
+    db.commit()
+
+
 def insert_events_to_db(
     events: list[dict[str, Any]],
     *,
     assign_clusters: bool = False,
     cluster_top_k: int = 1,
     similarity_threshold: float = 0.3,
+    insert_mode: str = "bulk",
+    batch_size: int = EVENTS_INSERT_BATCH_SIZE,
 ) -> tuple[int, int]:
     """
     Добавляет мероприятия в БД, пропуская дубликаты.
 
     Args:
         events: список словарей с данными мероприятий
+        insert_mode: "bulk" — пачки по batch_size одним executemany-INSERT,
+            "row" — каждое мероприятие отдельной транзакцией
 
     Returns:
         кортеж (добавлено, пропущено)
     """
     from sqlalchemy.orm import Session
     from src.core.database.connection import engine
-    from src.core.database.models import Events
+
+    if insert_mode not in EVENT_INSERT_MODES:
+        raise ValueError(f"Неизвестный режим вставки: {insert_mode}")
 
     added_count = 0
     skipped_count = 0
 
     with Session(engine) as db:
-        index = None
-        cluster_ids: list = []
-        vector_dim = 0
+        cluster_args = None
 
         if assign_clusters:
             index, cluster_ids, vector_dim = _prepare_cluster_index(db)
             if index is None:
                 print("⚠️  Кластеры не найдены или без центроидов. Привязка пропущена.")
-
-        for i, event in enumerate(events, 1):
-            try:
-                # Проверяем, существует ли мероприятие
-                if check_event_exists(db, event):
+            else:
+                cluster_args = (index, cluster_ids, vector_dim, cluster_top_k, similarity_threshold)
+
+        def insert_rows(rows: list[dict[str, Any]]) -> None:
+            nonlocal added_count, skipped_count
+            for event in rows:
+                try:
+                    _insert_event_row(db, event, cluster_args)
+                except Exception as e:
+                    db.rollback()
+                    print(f"   ❌ Ошибка при добавлении '{event.get('title', 'Без названия')}': {e}")
                     skipped_count += 1
-                    if i <= 5 or i % 10 == 0:
-                        print(f"   ⏭️  Пропущено (дубликат): {event.get('title', 'Без названия')}")
                     continue
 
-                # Подготавливаем vector_embedding
-                vector_embedding = event.get("vector_embedding")
-                # Если это список, преобразуем в формат для pgvector
-                # pgvector автоматически конвертирует список в Vector при сохранении
-
-                # Создаем новое мероприятие
-                new_event = Events(
-                    title=event.get("title", ""),
-                    short_description=event.get("short_description"),
-                    description=event.get("description"),
-                    format=event.get("format"),
-                    start_date=event.get("start_date"),
-                    end_date=event.get("end_date"),
-                    link=event.get("link"),
-                    image_url=event.get("image_url"),
-                    vector_embedding=vector_embedding,  # pgvector автоматически обработает список
-                )
-
-                db.add(new_event)
-                db.flush()
-
-                if assign_clusters and index is not None and cluster_ids:
-                    _assign_event_clusters(
-                        db,
-                        new_event.id,
-                        event.get("title", "Без названия"),
-                        vector_embedding,
-                        index,
-                        cluster_ids,
-                        vector_dim,
-                        cluster_top_k,
-                        similarity_threshold,
-                    )
-
-                db.commit()
-                db.refresh(new_event)
-
                 added_count += 1
                 if added_count <= 5 or added_count % 10 == 0:
                     print(f"   ✅ Добавлено в БД: {event.get('title', 'Без названия')}")
 
+        def flush_batch(batch: list[dict[str, Any]]) -> None:
+            nonlocal added_count
+            try:
+                _insert_events_batch(db, batch, cluster_args)
             except Exception as e:
+                # Одна битая запись не должна терять всю пачку — повторяем её построчно
                 db.rollback()
-                print(f"   ❌ Ошибка при добавлении '{event.get('title', 'Без названия')}': {e}")
+                print(f"   ⚠️  Ошибка пакетной вставки ({len(batch)} шт.), повтор построчно: {e}")
+                insert_rows(batch)
+                return
+
+            added_count += len(batch)
+            print(f"   ✅ Добавлено в БД: {len(batch)} (всего {added_count})")
+
+        batch: list[dict[str, Any]] = []
+        pending: dict[str, list[tuple[Any, Any]]] = {}
+
+        for i, event in enumerate(events, 1):
+            # Проверяем, существует ли мероприятие (в БД или в ещё не записанной пачке)
+            if check_event_exists(db, event) or _is_pending_duplicate(pending, event):
                 skipped_count += 1
-    
-    return added_count, skipped_count
+                if i <= 5 or i % 10 == 0:
+                    print(f"   ⏭️  Пропущено (дубликат): {event.get('title', 'Без названия')}")
+                continue
+
+            if insert_mode == "row":
+                insert_rows([event])
+                continue
 
+            batch.append(event)
+            _remember_pending(pending, event)
+            if len(batch) >= batch_size:
+                flush_batch(batch)
+                batch, pending = [], {}
+
+        if batch:
+            flush_batch(batch)
+
+    return added_count, skipped_count
@@ -70,7 +70,6 @@ def patch_models():
         patch('src.api.routes.bot_users.Students', Students),
         patch('src.api.routes.bot_users.Directions', Directions),
         patch('src.api.routes.bot_users.BotUsers', BotUsers),
-        patch('src.api.routes.events.Events', Events),
         patch('src.api.routes.students.Students', Students),
         patch('src.api.routes.students.Directions', Directions),
         # CRUD modules
@@ -169,11 +168,15 @@ def test_client(db_session):
         finally:
             pass
     
+    from src.api.routes.bot_users import clear_bot_user_cache
+    
+    clear_bot_user_cache()
     app = create_app()
     app.dependency_overrides[db_dependency] = override_get_db
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
+    clear_bot_user_cache()
 
 
 @pytest.fixture
@@ -42,3 +42,14 @@ class TestBotUsersAPI:
         response = test_client.post(f"/bot/users/{sample_bot_user.telegram_id}/activity")
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
+    
+    def test_get_bot_user_cache_invalidated_on_delete(self, test_client, sample_bot_user):
+        """Тест сброса кэша пользователя бота после удаления."""
+        response = test_client.get(f"/bot/users/{sample_bot_user.telegram_id}")
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = test_client.delete(f"/bot/users/{sample_bot_user.telegram_id}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        
+        response = test_client.get(f"/bot/users/{sample_bot_user.telegram_id}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -92,3 +92,54 @@ class TestEventsAPI:
         assert len(data["events"]) == 1
         assert data["events"][0]["title"] == "Активное мероприятие"
 
+    
+    def test_get_events_bulk_preserves_order(self, test_client, db_session):
+        """Тест, что bulk-запрос возвращает мероприятия в порядке запрошенных ID."""
+        events = []
+        for i in range(3):
+            event = Events(
+                id=uuid4(),
+                title=f"Мероприятие {i}",
+                is_active=True,
+                likes_count=0,
+                dislikes_count=0,
+                created_at=datetime.now()
+            )
+            db_session.add(event)
+            events.append(event)
+        db_session.commit()
+        
+        requested = [events[2].id, uuid4(), events[0].id, events[1].id]
+        response = test_client.post("/events/bulk", json={"ids": [str(event_id) for event_id in requested]})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [event["id"] for event in data["events"]] == [
+            str(events[2].id), str(events[0].id), str(events[1].id)
+        ]
+    
+    def test_list_upcoming_events_sorted_by_date(self, test_client, db_session):
+        """Тест ближайших мероприятий: только будущие активные, по возрастанию даты начала."""
+        from datetime import date, timedelta
+        
+        today = date.today()
+        for title, start_date, is_active in [
+            ("Через неделю", today + timedelta(days=7), True),
+            ("Прошедшее", today - timedelta(days=3), True),
+            ("Завтра", today + timedelta(days=1), True),
+            ("Неактивное", today + timedelta(days=2), False),
+        ]:
+            db_session.add(Events(
+                id=uuid4(),
+                title=title,
+                start_date=start_date,
+                is_active=is_active,
+                likes_count=0,
+                dislikes_count=0,
+                created_at=datetime.now()
+            ))
+        db_session.commit()
+        
+        response = test_client.get("/events/upcoming?limit=5")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [event["title"] for event in data["events"]] == ["Завтра", "Через неделю"]
@@ -126,4 +126,21 @@ class TestFavoritesAPI:
         )
         assert response.status_code == status.HTTP_200_OK
         assert response.json()["is_favorite"] is True
+    
+    def test_check_favorites_bulk(self, test_client, sample_student, sample_event, db_session):
+        """Тест пакетной проверки избранного."""
+        other_event_id = uuid4()
+        favorite = Favorites(
+            student_id=sample_student.id,
+            event_id=sample_event.id
+        )
+        db_session.add(favorite)
+        db_session.commit()
+        
+        response = test_client.post(
+            f"/favorites/by-student/{sample_student.id}/check",
+            json={"ids": [str(sample_event.id), str(other_event_id)]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["event_ids"] == [str(sample_event.id)]
 
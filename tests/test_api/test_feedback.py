@@ -37,13 +37,11 @@ class TestFeedbackAPI:
     
     def test_submit_feedback_invalid_rating(self, test_client, sample_student):
         """Тест отправки обратной связи с невалидным рейтингом."""
-        # Note: Schema doesn't validate rating range, so this will succeed
-        # If validation is needed, it should be added to FeedbackCreateSchema
+        # Рейтинг вне диапазона 1..5 отклоняется схемой FeedbackCreateSchema
         payload = {
             "student_id": str(sample_student.id),
             "rating": 10
         }
         response = test_client.post("/feedback", json=payload)
-        # Currently no validation, so this will succeed
-        assert response.status_code == status.HTTP_201_CREATED
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
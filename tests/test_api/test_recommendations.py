@@ -2,6 +2,7 @@
 Тесты для API routes рекомендаций.
 """
 import pytest
+from unittest.mock import patch
 from uuid import uuid4
 from datetime import datetime
 from fastapi import status
@@ -66,6 +67,53 @@ class TestRecommendationsAPI:
         data = response.json()
         assert len(data) == 3
     
+    def test_get_recommendations_with_offset(self, test_client, sample_student, db_session):
+        """Тест постраничного получения рекомендаций через offset."""
+        for i in range(5):
+            event = Events(
+                id=uuid4(),
+                title=f"Event {i}",
+                is_active=True,
+                likes_count=0,
+                dislikes_count=0,
+                created_at=datetime.now()
+            )
+            db_session.add(event)
+            db_session.flush()
+            
+            recommendation = Recommendations(
+                student_id=sample_student.id,
+                event_id=event.id,
+                score=0.9 - i * 0.1
+            )
+            db_session.add(recommendation)
+        db_session.commit()
+        
+        first = test_client.get(f"/recommendations/by-student/{sample_student.id}?limit=3").json()
+        second = test_client.get(f"/recommendations/by-student/{sample_student.id}?limit=3&offset=3").json()
+        assert len(first) == 3
+        assert len(second) == 2
+        assert {r["id"] for r in first}.isdisjoint(r["id"] for r in second)
+        assert first[-1]["score"] >= second[0]["score"]
+    
+    def test_get_recommendations_with_events(self, test_client, sample_student, sample_event, db_session):
+        """Тест получения рекомендаций вместе с мероприятиями."""
+        recommendation = Recommendations(
+            student_id=sample_student.id,
+            event_id=sample_event.id,
+            score=0.85
+        )
+        db_session.add(recommendation)
+        db_session.commit()
+        
+        response = test_client.get(f"/recommendations/by-student/{sample_student.id}/with-events")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["event_id"] == str(sample_event.id)
+        assert data[0]["event"]["id"] == str(sample_event.id)
+        assert data[0]["event"]["title"] == sample_event.title
+    
     def test_get_recommendations_sorted_by_score(self, test_client, sample_student, db_session):
         """Тест сортировки рекомендаций по score."""
         # Создаем рекомендации с разными score
@@ -99,3 +147,31 @@ class TestRecommendationsAPI:
         scores_received = [r["score"] for r in data]
         assert scores_received == sorted(scores, reverse=True)
 
+
+    def test_recalculate_for_student_sync_returns_stats(self, test_client):
+        """Тест синхронного пересчёта: в ответе статистика пересчёта."""
+        student_id = uuid4()
+        stats = {"students": 1, "recommendations": 3}
+        with patch('src.api.routes.recommendations.recalculate_scores_for_student', return_value=stats) as mock_recalc:
+            response = test_client.post(f"/recommendations/by-student/{student_id}/recalculate?min_score=0.2")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == stats
+        mock_recalc.assert_called_once()
+        assert mock_recalc.call_args.kwargs == {"student_id": student_id, "min_score": 0.2}
+
+    def test_recalculate_for_student_in_background(self, test_client):
+        """Тест фонового пересчёта: 202 сразу, задача выполняется в собственной сессии."""
+        student_id = uuid4()
+        with patch('src.api.routes.recommendations.SessionLocal') as mock_session_local, \
+             patch('src.api.routes.recommendations.recalculate_scores_for_student') as mock_recalc:
+            response = test_client.post(
+                f"/recommendations/by-student/{student_id}/recalculate",
+                params={"background": "true", "min_score": 0.5},
+            )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {"status": "scheduled"}
+        # TestClient выполняет фоновые задачи до возврата ответа
+        background_db = mock_session_local.return_value.__enter__.return_value
+        mock_recalc.assert_called_once_with(background_db, student_id=student_id, min_score=0.5)
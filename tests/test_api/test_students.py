@@ -3,8 +3,9 @@
 """
 import pytest
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import status
+from sqlalchemy import update
 from tests.test_models_sqlite import TestStudents as Students
 
 
@@ -78,3 +79,62 @@ class TestStudentsAPI:
         data = response.json()
         assert len(data["students"]) == 2
 
+
+    def test_list_students_with_cursor(self, test_client, db_session, sample_direction):
+        """Тест keyset-пагинации списка студентов по курсору."""
+        base = datetime(2024, 1, 1)
+        for i in range(5):
+            db_session.add(Students(
+                id=uuid4(),
+                participant_id=f"test_student_{i:03d}",
+                direction_id=sample_direction.id,
+                created_at=base + timedelta(minutes=i)
+            ))
+        db_session.commit()
+
+        response = test_client.get("/students?limit=3")
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert first_page["next_cursor"] is not None
+
+        response = test_client.get(
+            "/students",
+            params={
+                "limit": 3,
+                "cursor": first_page["next_cursor"],
+                "cursor_id": first_page["next_cursor_id"],
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 5
+        assert [s["participant_id"] for s in data["students"]] == ["test_student_001", "test_student_000"]
+        assert data["next_cursor"] is None
+
+    def test_list_students_rejects_partial_cursor(self, test_client):
+        """Тест: cursor без cursor_id (и наоборот) отклоняется, а не сбрасывает на первую страницу."""
+        response = test_client.get("/students", params={"cursor": "2024-01-01T00:00:00"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = test_client.get("/students", params={"cursor_id": str(uuid4())})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_list_students_no_cursor_for_null_created_at(self, test_client, db_session, sample_direction):
+        """Тест: по последней строке без created_at курсор не выдаётся."""
+        for i in range(2):
+            db_session.add(Students(
+                id=uuid4(),
+                participant_id=f"test_student_{i:03d}",
+                direction_id=sample_direction.id,
+            ))
+        db_session.commit()
+        # При вставке срабатывает server_default, поэтому NULL выставляется отдельным UPDATE
+        db_session.execute(update(Students).values(created_at=None))
+        db_session.commit()
+
+        response = test_client.get("/students?limit=1")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["students"]) == 1
+        assert data["next_cursor"] is None
+        assert data["next_cursor_id"] is None
@@ -41,14 +41,39 @@ async def test_show_personal_cabinet(mock_update_activity, mock_get_bot_user, mo
     }
     mock_update_with_callback.callback_query.answer = AsyncMock()
     
-    with patch('src.bot.handlers.favorites.api_client.get_favorites_count', new_callable=AsyncMock) as mock_count:
+    with patch('src.bot.handlers.favorites.api_client.get_favorites_count', new_callable=AsyncMock) as mock_count, \
+         patch('src.bot.handlers.favorites.api_client.get_favorites', new_callable=AsyncMock) as mock_get:
         mock_count.return_value = 5
+        mock_get.return_value = []
         
         await show_personal_cabinet(mock_update_with_callback, mock_context)
         
         mock_update_with_callback.callback_query.edit_message_text.assert_called_once()
 
 
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_show_favorites_reuses_cabinet_prefetch(mock_update_activity, mock_get_bot_user, mock_update_with_callback, mock_context):
+    """Тест: список, загруженный в личном кабинете, не запрашивается повторно."""
+    student_id = str(uuid4())
+    event_id = str(uuid4())
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": student_id}}
+    mock_context.user_data = {'student': {'id': student_id}}
+    favorites = [{"id": 1, "event": {"id": event_id, "title": "Test Event"}}]
+
+    with patch('src.bot.handlers.favorites.api_client.get_favorites_count', new_callable=AsyncMock) as mock_count, \
+         patch('src.bot.handlers.favorites.api_client.get_favorites', new_callable=AsyncMock) as mock_get:
+        mock_count.return_value = 1
+        mock_get.return_value = favorites
+
+        await show_personal_cabinet(mock_update_with_callback, mock_context)
+        await show_favorites(mock_update_with_callback, mock_context)
+
+        mock_get.assert_awaited_once()
+        assert mock_context.user_data['favorites_browser'].order == [event_id]
+
+
 @pytest.mark.asyncio
 @patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
 @patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
@@ -122,3 +147,51 @@ async def test_handle_favorite_action_remove(mock_update_activity, mock_get_bot_
         assert mock_update_with_callback.callback_query.answer.call_count >= 1
         mock_remove.assert_called_once()
 
+
+
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_handle_favorite_action_uses_cached_student_uuid(mock_update_activity, mock_get_bot_user, mock_update_with_callback, mock_context):
+    """Тест: UUID студента разбирается при авторизации и переиспользуется обработчиком."""
+    student_id = uuid4()
+    event_id = uuid4()
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": str(student_id)}}
+    mock_context.user_data = {}
+    mock_update_with_callback.callback_query.data = f"add_favorite_{event_id}"
+
+    with patch('src.bot.handlers.favorites.api_client.add_favorite', new_callable=AsyncMock) as mock_add, \
+         patch('src.bot.handlers.favorites.api_client.get_event', new_callable=AsyncMock) as mock_get_event:
+        mock_add.return_value = {}
+        mock_get_event.return_value = None
+
+        await handle_favorite_action(mock_update_with_callback, mock_context)
+
+        assert mock_context.user_data['student_uuid'] == student_id
+        mock_add.assert_awaited_once_with(student_id, str(event_id))
+        # Callback подтверждается один раз, итоговым уведомлением
+        mock_update_with_callback.callback_query.answer.assert_awaited_once_with("✅ Добавлено в избранное!")
+
+
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_handle_favorite_action_finds_event_in_search_cache(mock_update_activity, mock_get_bot_user, mock_update_with_callback, mock_context):
+    """Тест: событие из кэша поиска находится, даже если в контексте остался список избранного."""
+    from src.bot.handlers.favorites import FavoritesBrowser
+
+    event_id = str(uuid4())
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": str(uuid4())}}
+    mock_context.user_data = {
+        'favorites_browser': FavoritesBrowser(events_by_id={}, order=[]),
+        'search_events': {event_id: {"id": event_id, "title": "Test Event"}},
+    }
+    mock_update_with_callback.callback_query.data = f"add_favorite_{event_id}"
+    mock_update_with_callback.callback_query.message = None
+
+    with patch('src.bot.handlers.favorites.api_client.add_favorite', new_callable=AsyncMock), \
+         patch('src.bot.handlers.favorites.api_client.get_event', new_callable=AsyncMock) as mock_get_event:
+        await handle_favorite_action(mock_update_with_callback, mock_context)
+
+        mock_get_event.assert_not_awaited()
+        mock_update_with_callback.callback_query.edit_message_text.assert_awaited_once()
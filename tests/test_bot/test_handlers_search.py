@@ -1,6 +1,8 @@
 """
 Тесты для handlers поиска.
 """
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -8,7 +10,8 @@ from telegram import Update
 from src.bot.handlers.search import (
     show_search_filters,
     handle_search_filter,
-    show_next_search_result
+    show_next_search_result,
+    SEARCH_CACHE_TTL,
 )
 
 
@@ -49,7 +52,7 @@ async def test_handle_search_filter(mock_update_activity, mock_get_bot_user, moc
     mock_update_with_callback.callback_query.answer = AsyncMock()
     
     with patch('src.bot.handlers.search.api_client.get_active_events', new_callable=AsyncMock) as mock_get, \
-         patch('src.bot.handlers.search.api_client.check_favorite', new_callable=AsyncMock) as mock_check:
+         patch('src.bot.handlers.search.api_client.list_favorite_event_ids', new_callable=AsyncMock) as mock_check:
         mock_get.return_value = {
             'events': [
                 {
@@ -62,9 +65,74 @@ async def test_handle_search_filter(mock_update_activity, mock_get_bot_user, moc
             ],
             'total': 1
         }
-        mock_check.return_value = False
+        mock_check.return_value = set()
         
         await handle_search_filter(mock_update_with_callback, mock_context)
         
         mock_update_with_callback.callback_query.edit_message_text.assert_called_once()
 
+
+
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_show_next_search_result_refreshes_stale_window(mock_update_activity, mock_get_bot_user, mock_update_with_callback, mock_context):
+    """Тест: устаревшее окно показывается сразу и перечитывается в фоне одним bulk-запросом."""
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": "test"}}
+    first_id, second_id = str(uuid4()), str(uuid4())
+    mock_context.user_data = {
+        'search_results': [first_id, second_id],
+        'search_events': {
+            first_id: {'id': first_id, 'title': 'First', 'likes_count': 0},
+            second_id: {'id': second_id, 'title': 'Second', 'likes_count': 0},
+        },
+        'search_loaded_at': time.monotonic(),
+        'current_search_index': 0,
+    }
+    mock_update_with_callback.callback_query.message = None
+
+    await show_next_search_result(mock_update_with_callback, mock_context)
+    mock_context.application.create_task.assert_not_called()
+
+    mock_context.user_data['search_loaded_at'] -= SEARCH_CACHE_TTL + 1
+    await show_next_search_result(mock_update_with_callback, mock_context)
+    mock_context.application.create_task.assert_called_once()
+    refresh = mock_context.application.create_task.call_args.args[0]
+
+    with patch('src.bot.handlers.search.api_client.get_events_bulk', new_callable=AsyncMock) as mock_bulk:
+        mock_bulk.return_value = {
+            'events': [
+                {'id': first_id, 'title': 'First', 'likes_count': 5, 'description': 'long text'},
+                {'id': second_id, 'title': 'Second', 'likes_count': 1},
+            ],
+            'total': 2,
+        }
+        await refresh
+
+    mock_bulk.assert_awaited_once_with([first_id, second_id])
+    refreshed = mock_context.user_data['search_events'][first_id]
+    assert refreshed['likes_count'] == 5
+    assert 'description' not in refreshed
+
+
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_handle_search_filter_direction_uses_stored_cluster(mock_update_activity, mock_get_bot_user, mock_update_with_callback, mock_context):
+    """Тест: фильтр по направлению берет кластер, сохраненный при авторизации."""
+    cluster_id = str(uuid4())
+    mock_get_bot_user.return_value = {
+        "is_linked": True,
+        "student": {"id": str(uuid4()), "direction": {"id": str(uuid4()), "title": "ИТ", "cluster_id": cluster_id}},
+    }
+    mock_update_with_callback.callback_query.data = "filter_direction"
+
+    with patch('src.bot.handlers.search.api_client.get_events_by_clusters', new_callable=AsyncMock) as mock_by_clusters, \
+         patch('src.bot.handlers.search.api_client.list_favorite_event_ids', new_callable=AsyncMock) as mock_favorites:
+        mock_by_clusters.return_value = {'events': [{'id': str(uuid4()), 'title': 'Test Event'}], 'total': 1}
+        mock_favorites.return_value = set()
+
+        await handle_search_filter(mock_update_with_callback, mock_context)
+
+    assert mock_context.user_data['student_cluster_id'] == cluster_id
+    mock_by_clusters.assert_awaited_once_with([cluster_id], limit=50)
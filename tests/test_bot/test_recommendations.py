@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from telegram import Update, InlineKeyboardMarkup
 from src.bot.handlers.recommendations import show_recommendations, handle_recommendation_feedback, \
-    show_next_recommendation
+    show_next_recommendation, format_event_card, _format_event_card
 from datetime import datetime, timedelta
 from uuid import uuid4
 
@@ -29,9 +29,8 @@ async def test_show_recommendations(mock_update_activity, mock_get_bot_user, moc
     }
     mock_update_with_callback.callback_query.answer = AsyncMock()
     
-    with patch('src.bot.handlers.recommendations.api_client.get_recommendations', new_callable=AsyncMock) as mock_get, \
-         patch('src.bot.handlers.recommendations.api_client.get_events_bulk', new_callable=AsyncMock) as mock_bulk, \
-         patch('src.bot.handlers.recommendations.api_client.check_favorite', new_callable=AsyncMock) as mock_check:
+    with patch('src.bot.handlers.recommendations.api_client.get_recommendations_with_events', new_callable=AsyncMock) as mock_get, \
+         patch('src.bot.handlers.recommendations.api_client.list_favorite_event_ids', new_callable=AsyncMock) as mock_check:
         event_id = str(uuid4())
         event_data = {
             'id': event_id,
@@ -46,11 +45,11 @@ async def test_show_recommendations(mock_update_activity, mock_get_bot_user, moc
         mock_get.return_value = [
             {
                 'id': 1,
-                'event_id': event_id
+                'event_id': event_id,
+                'event': event_data
             }
         ]
-        mock_bulk.return_value = {'events': [event_data]}
-        mock_check.return_value = False
+        mock_check.return_value = set()
         
         await show_recommendations(mock_update_with_callback, mock_context)
 
@@ -71,6 +70,32 @@ async def test_show_recommendations(mock_update_activity, mock_get_bot_user, moc
     assert "🎯" in text  # Проверяем что это карточка мероприятия
 
 
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_show_recommendations_uses_joined_events(mock_update_activity, mock_get_bot_user, mock_update_with_callback):
+    """Тестирует, что мероприятия берутся из ответа с рекомендациями без отдельной загрузки."""
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": str(uuid4())}}
+    mock_context = MagicMock()
+    mock_context.user_data = {}
+    event_id = str(uuid4())
+    event_data = {'id': event_id, 'title': 'Test Event', 'likes_count': 0, 'dislikes_count': 0}
+
+    with patch('src.bot.handlers.recommendations.api_client.get_recommendations_with_events', new_callable=AsyncMock) as mock_get, \
+         patch('src.bot.handlers.recommendations.api_client.get_events_bulk', new_callable=AsyncMock) as mock_bulk, \
+         patch('src.bot.handlers.recommendations.api_client.get_event', new_callable=AsyncMock) as mock_get_event, \
+         patch('src.bot.handlers.recommendations.api_client.list_favorite_event_ids', new_callable=AsyncMock) as mock_check:
+        mock_get.return_value = [{'id': 1, 'event_id': event_id, 'event': event_data}]
+        mock_check.return_value = set()
+
+        await show_recommendations(mock_update_with_callback, mock_context)
+
+    mock_bulk.assert_not_called()
+    mock_get_event.assert_not_called()
+    assert mock_context.user_data['recommendations_events'][event_id] == event_data
+    assert mock_context.user_data['current_recommendations'] == [{'id': 1, 'event_id': event_id}]
+
+
 @pytest.mark.asyncio
 @patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
 @patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
@@ -88,10 +113,8 @@ async def test_handle_recommendation_feedback_like(mock_update_activity, mock_ge
         'recommendations_events': {event_id: {'id': event_id, 'title': 'Test'}}
     }
 
-    with patch('src.bot.handlers.recommendations.api_client.like_event', new_callable=AsyncMock) as mock_like, \
-         patch('src.bot.handlers.recommendations.api_client.check_favorite', new_callable=AsyncMock) as mock_check:
+    with patch('src.bot.handlers.recommendations.api_client.like_event', new_callable=AsyncMock) as mock_like:
         mock_like.return_value = {'id': event_id, 'title': 'Test'}
-        mock_check.return_value = False
         
         await handle_recommendation_feedback(mock_update_with_callback, mock_context)
 
@@ -133,6 +156,26 @@ async def test_handle_recommendation_feedback_dislike(mock_update_activity, mock
         mock_next.assert_called_once()
 
 
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_handle_recommendation_feedback_ignores_malformed_data(mock_update_activity, mock_get_bot_user, mock_update_with_callback):
+    """Тестирует, что неизвестное действие и неверный id не доходят до API."""
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": "test"}}
+    mock_context = MagicMock()
+    mock_context.user_data = {'student': {'id': str(uuid4())}}
+    mock_update_with_callback.callback_query.answer = AsyncMock()
+
+    with patch('src.bot.handlers.recommendations.api_client.like_event', new_callable=AsyncMock) as mock_like, \
+         patch('src.bot.handlers.recommendations.api_client.dislike_event', new_callable=AsyncMock) as mock_dislike:
+        for data in (f"share_{uuid4()}", "like_not_a_uuid"):
+            mock_update_with_callback.callback_query.data = data
+            await handle_recommendation_feedback(mock_update_with_callback, mock_context)
+
+    mock_like.assert_not_called()
+    mock_dislike.assert_not_called()
+
+
 @pytest.mark.asyncio
 @patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
 @patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
@@ -177,4 +220,71 @@ async def test_show_next_recommendation(mock_update_activity, mock_get_bot_user,
     assert mock_update_with_callback.callback_query.edit_message_text.called
 
     # Проверяем, что индекс обновился
-    assert mock_context.user_data['current_recommendation_index'] == 1
\ No newline at end of file
+    assert mock_context.user_data['current_recommendation_index'] == 1
+
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_show_next_recommendation_prefetches_following_event(mock_update_activity, mock_get_bot_user, mock_update_with_callback):
+    """Тестирует фоновую загрузку следующего мероприятия после показа карточки."""
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": "test"}}
+    mock_context = MagicMock()
+    shown_id, next_id = str(uuid4()), str(uuid4())
+    mock_context.user_data = {
+        'current_recommendations': [{'event_id': next_id}, {'event_id': shown_id}],
+        'current_recommendation_index': 0,
+        'recommendations_events': {shown_id: {'id': shown_id, 'title': 'Shown'}},
+    }
+    mock_update_with_callback.callback_query.answer = AsyncMock()
+
+    await show_next_recommendation(mock_update_with_callback, mock_context)
+
+    mock_context.application.create_task.assert_called_once()
+    prefetch = mock_context.application.create_task.call_args.args[0]
+    with patch('src.bot.handlers.recommendations.api_client.get_event', new_callable=AsyncMock) as mock_get_event:
+        mock_get_event.return_value = {'id': next_id, 'title': 'Next'}
+        await prefetch
+
+    assert mock_context.user_data['recommendations_events'][next_id]['title'] == 'Next'
+
+
+@pytest.mark.asyncio
+@patch('src.bot.middlewares.auth_middleware.api_client.get_bot_user', new_callable=AsyncMock)
+@patch('src.bot.middlewares.auth_middleware.api_client.update_bot_user_activity', new_callable=AsyncMock)
+async def test_show_next_recommendation_uses_cached_favorite_ids(mock_update_activity, mock_get_bot_user, mock_update_with_callback):
+    """Тестирует, что статус избранного берется из множества окна без запроса к API."""
+    mock_get_bot_user.return_value = {"is_linked": True, "student": {"id": str(uuid4())}}
+    mock_context = MagicMock()
+    first_id, second_id = str(uuid4()), str(uuid4())
+    mock_context.user_data = {
+        'current_recommendations': [{'event_id': first_id}, {'event_id': second_id}],
+        'current_recommendation_index': 0,
+        'recommendations_events': {
+            first_id: {'id': first_id, 'title': 'First'},
+            second_id: {'id': second_id, 'title': 'Second'},
+        },
+        'recommendations_favorite_ids': {second_id},
+    }
+    mock_update_with_callback.callback_query.answer = AsyncMock()
+
+    with patch('src.bot.handlers.recommendations.api_client.check_favorite', new_callable=AsyncMock) as mock_check:
+        await show_next_recommendation(mock_update_with_callback, mock_context)
+
+    mock_check.assert_not_called()
+    markup = mock_update_with_callback.callback_query.edit_message_text.call_args.kwargs['reply_markup']
+    callbacks = [button.callback_data for row in markup.inline_keyboard for button in row]
+    assert f"remove_favorite_{second_id}" in callbacks
+
+
+def test_format_event_card_is_memoized_by_displayed_values():
+    """Тестирует, что карточка берется из кэша, пока не изменились выводимые поля."""
+    _format_event_card.cache_clear()
+    event = {'id': str(uuid4()), 'title': 'Event', 'start_date': '2025-01-20', 'likes_count': 1, 'dislikes_count': 0}
+
+    first = format_event_card(event)
+    assert format_event_card(dict(event)) is first
+    assert _format_event_card.cache_info().hits == 1
+
+    liked = format_event_card({**event, 'likes_count': 2})
+    assert liked != first
+    assert "👍 2" in liked
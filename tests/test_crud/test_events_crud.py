@@ -9,6 +9,7 @@ from src.core.database.crud.events import (
     create_event,
     get_event_by_id,
     get_active_events,
+    get_events_by_ids,
     increment_likes,
     increment_dislikes
 )
@@ -60,6 +61,12 @@ class TestEventsCRUD:
         assert active.id in event_ids
         assert inactive.id not in event_ids
     
+    def test_get_events_by_ids_returns_projected_rows(self, db_session, sample_event):
+        """Тест выборки по id: строки без эмбеддинга, неизвестные id пропускаются."""
+        rows = get_events_by_ids(db_session, [sample_event.id, uuid4()])
+        assert [row.id for row in rows] == [sample_event.id]
+        assert "vector_embedding" not in rows[0]._mapping
+    
     def test_like_event(self, db_session, sample_event):
         """Тест лайка мероприятия."""
         initial_likes = sample_event.likes_count
@@ -74,6 +81,16 @@ class TestEventsCRUD:
         db_session.refresh(sample_event)
         assert sample_event.dislikes_count == initial_dislikes + 1
     
+    def test_like_event_returns_updated_row(self, db_session, sample_event):
+        """Тест, что лайк возвращает обновлённую строку без отдельного чтения."""
+        initial_likes = sample_event.likes_count
+        row = increment_likes(db_session, sample_event.id)
+        assert row is not None
+        assert row.id == sample_event.id
+        assert row.likes_count == initial_likes + 1
+        
+        assert increment_likes(db_session, uuid4()) is None
+    
     def test_delete_event(self, db_session, sample_event):
         """Тест удаления мероприятия."""
         event_id = sample_event.id
@@ -60,6 +60,15 @@ class TestFavoritesCRUD:
         assert len(favorites) == 1
         assert favorites[0].event_id == sample_event.id
     
+    def test_get_favorites_for_student_loads_events(self, db_session, sample_student, sample_event):
+        """Тест, что мероприятия подгружаются вместе с избранным."""
+        add_favorite(db_session, sample_student.id, sample_event.id)
+        db_session.expire_all()
+        
+        favorites = get_favorites_for_student(db_session, sample_student.id)
+        assert "event" in favorites[0].__dict__
+        assert favorites[0].event.id == sample_event.id
+    
     def test_is_favorite(self, db_session, sample_student, sample_event):
         """Тест проверки наличия в избранном."""
         # До добавления
@@ -39,7 +39,7 @@ def test_parse_event_page_with_sample_html(monkeypatch):
             encoding = "utf-8"
         return R()
 
-    monkeypatch.setattr("src.parsing.parse_leaderid.requests.get", fake_get)
+    monkeypatch.setattr("src.parsing.parse_leaderid._SESSION.get", fake_get)
     data = parse_event_page("https://fake-url")
 
     assert data["title"] == "Тестовое мероприятие"
@@ -71,7 +71,7 @@ def test_parse_event_page_text_normalization(monkeypatch):
             encoding = "utf-8"
         return R()
 
-    monkeypatch.setattr("src.parsing.parse_leaderid.requests.get", fake_get)
+    monkeypatch.setattr("src.parsing.parse_leaderid._SESSION.get", fake_get)
     data = parse_event_page("x")
 
     assert "Строка 1" in data["description"]
@@ -125,7 +125,7 @@ def test_parse_event_page_handles_request_error(monkeypatch):
     def fake_get(*_, **__):
         raise requests.RequestException("network failure")
 
-    monkeypatch.setattr("src.parsing.parse_leaderid.requests.get", fake_get)
+    monkeypatch.setattr("src.parsing.parse_leaderid._SESSION.get", fake_get)
     result = parse_event_page("https://fake-url")
 
     assert isinstance(result, dict)
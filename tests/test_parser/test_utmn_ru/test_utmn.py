@@ -32,7 +32,7 @@ def test_parse_event_page_with_sample_html(monkeypatch):
             encoding = "utf-8"
         return R()
 
-    monkeypatch.setattr("src.parsing.parse_utmn.requests.get", fake_get)
+    monkeypatch.setattr("src.parsing.parse_utmn._SESSION.get", fake_get)
 
     data = parse_event_page("https://fake-url")
     assert data["title"] == "Тестовое событие"
@@ -78,7 +78,7 @@ def test_parse_event_page_text_normalization(monkeypatch):
             encoding = "utf-8"
         return R()
 
-    monkeypatch.setattr("src.parsing.parse_utmn.requests.get", fake_get)
+    monkeypatch.setattr("src.parsing.parse_utmn._SESSION.get", fake_get)
 
     data = parse_event_page("x")
     assert "\n\n" not in data["description"]
@@ -129,7 +129,7 @@ def test_parse_event_page_handles_request_error(monkeypatch):
     def fake_get(*_, **__):
         raise requests.RequestException("network failure")
 
-    monkeypatch.setattr("src.parsing.parse_utmn.requests.get", fake_get)
+    monkeypatch.setattr("src.parsing.parse_utmn._SESSION.get", fake_get)
 
     result = parse_event_page("https://fake-url")
     assert isinstance(result, dict)
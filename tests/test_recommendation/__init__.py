@@ -0,0 +1 @@
+"""Тесты для модулей рекомендательной системы."""
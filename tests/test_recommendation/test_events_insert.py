@@ -0,0 +1,105 @@
+"""
+Тесты для пакетной загрузки мероприятий в БД (insert_events_to_db).
+"""
+import pytest
+from datetime import date
+from sqlalchemy import select
+
+from tests.test_models_sqlite import TestEvents as Events
+from src.recommendation.events import utils
+from src.recommendation.events.utils import (
+    _is_pending_duplicate,
+    _remember_pending,
+    insert_events_to_db,
+)
+
+
+def _pending_for(*events):
+    pending = {}
+    for event in events:
+        _remember_pending(pending, event)
+    return pending
+
+
+class TestPendingDuplicates:
+    """Тесты поиска дубликатов внутри ещё не записанной пачки."""
+
+    def test_duplicate_by_title_and_start_date(self):
+        pending = _pending_for({"title": "Хакатон", "start_date": date(2025, 3, 1), "link": "https://a"})
+        assert _is_pending_duplicate(pending, {"title": "Хакатон", "start_date": date(2025, 3, 1)})
+        assert not _is_pending_duplicate(pending, {"title": "Хакатон", "start_date": date(2025, 3, 2)})
+
+    def test_duplicate_by_title_and_link(self):
+        pending = _pending_for({"title": "Лекция", "link": "https://example.com/1"})
+        assert _is_pending_duplicate(pending, {"title": "Лекция", "link": " https://example.com/1 "})
+        assert not _is_pending_duplicate(pending, {"title": "Лекция", "link": "https://example.com/2"})
+
+    def test_duplicate_by_title_only(self):
+        pending = _pending_for({"title": "Клуб", "start_date": date(2025, 3, 1), "link": "https://a"})
+        assert _is_pending_duplicate(pending, {"title": " Клуб "})
+        assert not _is_pending_duplicate(pending, {"title": "Другой клуб"})
+
+    def test_event_without_title_is_never_duplicate(self):
+        pending = _pending_for({"title": ""})
+        assert not _is_pending_duplicate(pending, {"title": ""})
+        assert pending == {}
+
+
+class TestInsertEventsToDb:
+    """Тесты вставки мероприятий пачками и построчно."""
+
+    @pytest.fixture(autouse=True)
+    def use_test_engine(self, db_engine, monkeypatch):
+        # insert_events_to_db открывает собственную сессию на движке из connection
+        monkeypatch.setattr("src.core.database.connection.engine", db_engine)
+
+    @staticmethod
+    def _titles(db_session):
+        return sorted(db_session.scalars(select(Events.title)))
+
+    def test_bulk_skips_in_batch_duplicates(self, db_session):
+        events = [
+            {"title": "A", "start_date": date(2025, 1, 1)},
+            {"title": "A", "start_date": date(2025, 1, 1)},
+            {"title": "B", "link": "https://b"},
+            {"title": "B", "link": "https://b"},
+            {"title": "C"},
+        ]
+
+        added, skipped = insert_events_to_db(events, batch_size=10)
+
+        assert (added, skipped) == (3, 2)
+        assert self._titles(db_session) == ["A", "B", "C"]
+
+    def test_bulk_skips_existing_events_across_batches(self, db_session):
+        events = [{"title": f"E{i}"} for i in range(3)] + [{"title": "E0"}]
+
+        added, skipped = insert_events_to_db(events, batch_size=2)
+
+        assert (added, skipped) == (3, 1)
+        assert self._titles(db_session) == ["E0", "E1", "E2"]
+
+    def test_failed_batch_falls_back_to_rows(self, db_session):
+        # title=None нарушает NOT NULL — пачка падает целиком и повторяется построчно
+        events = [{"title": "Good 1"}, {"title": None}, {"title": "Good 2"}]
+
+        added, skipped = insert_events_to_db(events, batch_size=10)
+
+        assert (added, skipped) == (2, 1)
+        assert self._titles(db_session) == ["Good 1", "Good 2"]
+
+    def test_row_mode_inserts_each_event_separately(self, db_session, monkeypatch):
+        def fail_batch(*args, **kwargs):
+            raise AssertionError("пакетная вставка не должна вызываться в режиме row")
+
+        monkeypatch.setattr(utils, "_insert_events_batch", fail_batch)
+        events = [{"title": "R1"}, {"title": None}, {"title": "R1"}, {"title": "R2"}]
+
+        added, skipped = insert_events_to_db(events, insert_mode="row")
+
+        assert (added, skipped) == (2, 2)
+        assert self._titles(db_session) == ["R1", "R2"]
+
+    def test_unknown_insert_mode_is_rejected(self):
+        with pytest.raises(ValueError):
+            insert_events_to_db([], insert_mode="copy")